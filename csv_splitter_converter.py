@@ -1,10 +1,261 @@
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 import os
+import io
+import csv
 from pathlib import Path
 import math
 import sys
+import json
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 
+from csv_to_parquet import (ENGINES, validate_engine, iter_csv_batches, split_byte_ranges,
+                            count_csv_records, estimate_csv_records, unify_schemas,
+                            conform_to_schema, read_csv_header, iter_csv_chunks,
+                            write_dataset_metadata, PartitionedWriter,
+                            DEFAULT_MAX_OPEN_WRITERS, iter_sorted_batches,
+                            DEFAULT_SORT_MEMORY_MB, ParquetLayout, parse_row_group_size,
+                            DEFAULT_ROW_GROUP_MB, read_csv_sample, COMPRESSIONS,
+                            COMPRESSION_OBJECTIVES, infer_csv_schema)
+
+# Evenly spaced positions sampled when estimating the row width
+DEFAULT_SAMPLE_STRATA = 10
+
+# Rows parsed at each sampled position, and the bytes read to find them
+ROWS_PER_STRATUM = 200
+STRATUM_WINDOW_BYTES = 1024 * 1024
+
+# Newlines tried at each position before giving up on finding a record start
+MAX_RESYNC_ATTEMPTS = 5
+
+# Encoded chunks that may wait for the writer in pipelined mode
+DEFAULT_QUEUE_DEPTH = 4
+
+# Progress of a sequential split, updated after every committed chunk
+CHECKPOINT_NAME = '_checkpoint.json'
+
+# Rows parsed per read when chunks are regrouped to an on-disk size target
+ADAPTIVE_READ_ROWS = 50000
+
+# Index of key intervals written next to range-partitioned chunks
+RANGE_INDEX_NAME = '_ranges.json'
+
+# Index of hash buckets written next to bucketed chunks
+BUCKET_INDEX_NAME = '_buckets.json'
+
+# Upper bound on positions sampled to place range boundaries
+MAX_RANGE_SAMPLE_STRATA = 200
+
+# Rows trial-encoded to measure compressed bytes per row before the first chunk
+CALIBRATION_ROWS = 10000
+
+def encoded_bytes_per_row(table, layout=None):
+    """Compressed Parquet bytes per row of a table, from an in-memory encoding"""
+    if table.num_rows == 0:
+        return None
+    sink = io.BytesIO()
+    (layout or ParquetLayout()).write_table(table, sink)
+    return sink.tell() / table.num_rows
+
+class ChunkSizeController:
+    """
+    Online controller steering rows per chunk towards a target on-disk size.
+    
+    After every chunk is written its actual compressed bytes per row are
+    folded into a running estimate, and the next chunk gets
+    target_bytes / bytes_per_row rows.
+    """
+    
+    def __init__(self, target_bytes, bytes_per_row=None, smoothing=0.7, layout=None):
+        """
+        Parameters:
+        target_bytes (float): Desired size of each chunk file in bytes
+        bytes_per_row (float): Initial estimate of compressed bytes per row. If
+                               None it is calibrated from the first batch read
+        smoothing (float): Weight of the newest measurement (0-1)
+        layout (ParquetLayout): Codec and page settings used for calibration
+        """
+        self.target_bytes = target_bytes
+        self.bytes_per_row = bytes_per_row
+        self.smoothing = smoothing
+        self.layout = layout
+        self.measured_chunks = 0
+    
+    @property
+    def rows_per_chunk(self):
+        if self.bytes_per_row is None:
+            return ADAPTIVE_READ_ROWS
+        return max(1, int(self.target_bytes / max(self.bytes_per_row, 1e-3)))
+    
+    def calibrate(self, table):
+        """Set the initial estimate from a trial encoding if there is none yet"""
+        if self.bytes_per_row is None:
+            self.bytes_per_row = encoded_bytes_per_row(table, self.layout)
+    
+    def update(self, rows, file_bytes):
+        """Record the size of a chunk that was just written"""
+        if rows <= 0 or file_bytes <= 0:
+            return
+        measured = file_bytes / rows
+        if self.measured_chunks == 0:
+            # The first real chunk outweighs the initial trial encoding
+            self.bytes_per_row = measured
+        else:
+            self.bytes_per_row = self.smoothing * measured + (1 - self.smoothing) * self.bytes_per_row
+        self.measured_chunks += 1
+
+def _concat_batches(tables):
+    """Concatenate separately parsed batches, reconciling their inferred types"""
+    if len(tables) == 1:
+        return tables[0]
+    schema = unify_schemas([table.schema for table in tables])
+    return pa.concat_tables([conform_to_schema(table, schema) for table in tables])
+
+def _regroup_chunks(batches, controller):
+    """
+    Regroup parsed batches into chunks sized by the controller. The row
+    count is read from the controller for every chunk, so feedback from the
+    previous chunk is applied as long as it is given before asking for the next.
+    """
+    pending = []
+    pending_rows = 0
+    yielded = False
+    for batch in batches:
+        controller.calibrate(batch)
+        pending.append(batch)
+        pending_rows += batch.num_rows
+        
+        while pending_rows >= controller.rows_per_chunk:
+            rows = controller.rows_per_chunk
+            table = _concat_batches(pending)
+            yield table.slice(0, rows)
+            yielded = True
+            
+            rest = table.slice(rows)
+            pending = [rest]
+            pending_rows = rest.num_rows
+    
+    if pending_rows or not yielded:
+        yield _concat_batches(pending)
+
+def _iter_chunks(source, rows_per_chunk, engine, byte_range=None, controller=None):
+    """Parse the CSV into chunks of fixed or controller-driven size"""
+    if controller is None:
+        return iter_csv_batches(source, rows_per_chunk, engine=engine,
+                                skip_bad_lines=True, byte_range=byte_range)
+    
+    read_rows = max(1, min(controller.rows_per_chunk, ADAPTIVE_READ_ROWS))
+    batches = iter_csv_batches(source, read_rows, engine=engine,
+                               skip_bad_lines=True, byte_range=byte_range)
+    return _regroup_chunks(batches, controller)
+
+def _group_positions(indices):
+    """Yield (index, row positions) for every distinct value in indices, keeping row order"""
+    order = np.argsort(indices, kind='stable')
+    found, starts = np.unique(indices[order], return_index=True)
+    return zip((int(index) for index in found), np.split(order, starts[1:]))
+
+def bucket_indices(column, buckets):
+    """
+    Stable hash bucket of every value in an Arrow column.
+    
+    Values are hashed in their string form, so the same key lands in the same
+    bucket whether it was parsed as an integer, a float or a string, and
+    across runs and extracts.
+    """
+    values = column.cast(pa.string()).to_numpy(zero_copy_only=False)
+    return (pd.util.hash_array(values, categorize=True) % np.uint64(buckets)).astype(np.int64)
+
+def _encode_parquet(table, layout=None):
+    """Encode a table as a complete Parquet file in memory"""
+    sink = pa.BufferOutputStream()
+    (layout or ParquetLayout()).write_table(table, sink)
+    return sink.getvalue()
+
+def _conform_chunk(chunk, schema):
+    """
+    Cast a chunk to schema, widening the schema first if the chunk holds
+    values it cannot take. Returns the cast chunk and the schema now in use.
+    """
+    try:
+        return conform_to_schema(chunk, schema), schema
+    except ValueError:
+        schema = unify_schemas([schema, chunk.schema])
+        return conform_to_schema(chunk, schema), schema
+
+def _conform_chunks(chunks, schema):
+    """
+    Cast every chunk to a schema inferred for the whole file, so the chunks
+    form a dataset with a single schema. Chunks that need wider types widen
+    it; chunks written before then are rewritten by _unify_chunk_files.
+    """
+    for chunk, end_offset in chunks:
+        chunk, schema = _conform_chunk(chunk, schema)
+        yield chunk, end_offset
+
+def _unify_chunk_files(files, layout=None):
+    """
+    Rewrite the files whose schema differs from the unified schema of all of
+    them, one file in memory at a time, so every file can be summarized in
+    _metadata. Returns the number of files rewritten.
+    """
+    layout = layout or ParquetLayout()
+    schemas = [pq.read_schema(path) for path in files]
+    if not schemas:
+        return 0
+    schema = unify_schemas(schemas)
+    rewritten = 0
+    for path, file_schema in zip(files, schemas):
+        if file_schema.equals(schema, check_metadata=False):
+            continue
+        table = conform_to_schema(pq.read_table(path), schema)
+        tmp_file = Path(path).with_name(Path(path).name + '.tmp')
+        layout.write_table(table, tmp_file)
+        os.replace(tmp_file, path)
+        rewritten += 1
+    return rewritten
+
+def _convert_range_to_chunks(input_csv, byte_range, output_dir, rows_per_chunk, engine,
+                             target_bytes=None, layout=None, schema=None):
+    """
+    Worker for parallel splitting: convert one byte range of the CSV into
+    chunk files under temporary names. The caller renames them in order.
+    When target_bytes is given chunk sizes are steered towards it, starting
+    from a trial encoding of the range's own first batch. When schema is
+    given chunks are cast to it, widening it where needed.
+    
+    Returns:
+    list: Temporary chunk paths in the order they were written
+    """
+    layout = layout or ParquetLayout()
+    written = []
+    try:
+        controller = None
+        if target_bytes:
+            controller = ChunkSizeController(target_bytes, layout=layout)
+        
+        chunks = _iter_chunks(input_csv, rows_per_chunk, engine, byte_range, controller)
+        for chunk_num, chunk in enumerate(chunks):
+            if chunk.num_rows == 0:
+                continue
+            if schema is not None:
+                chunk, schema = _conform_chunk(chunk, schema)
+            output_file = Path(output_dir) / f".range_{byte_range[0]:015d}_{chunk_num:06d}.parquet.tmp"
+            layout.write_table(chunk, output_file)
+            written.append(output_file)
+            if controller is not None:
+                controller.update(chunk.num_rows, os.path.getsize(output_file))
+        return written
+    except Exception:
+        for output_file in written:
+            os.remove(output_file)
+        raise
+
 class CSVSplitterConverter:
     def __init__(self, chunk_size_mb=250):
         """
@@ -15,22 +266,113 @@ class CSVSplitterConverter:
         """
         self.chunk_size_mb = float(chunk_size_mb)
         self.bytes_per_mb = 1024 * 1024
+        self.row_width_stats = None
+        self.layout = ParquetLayout()
     
-    def estimate_rows_per_chunk(self, csv_path, chunk_size_mb):
+    def _parse_stratum(self, window, columns):
+        """
+        Parse complete records from a window of bytes taken at some offset.
+        
+        The window may start in the middle of a record, or even inside a
+        quoted field, so parsing starts after each of the first few newlines
+        in turn until every record has exactly one field per column. At
+        offset 0 the first newline skipped is the end of the header.
+        
+        Returns:
+        tuple: (DataFrame of up to ROWS_PER_STRATUM rows, raw CSV bytes per
+               row), or None if no record boundary was found
+        """
+        end = window.rfind(b'\n') + 1
+        start = 0
+        for _ in range(MAX_RESYNC_ATTEMPTS):
+            start = window.find(b'\n', start) + 1
+            if start <= 0 or end <= start:
+                return None
+            
+            text = window[start:end].decode('utf-8', errors='replace')
+            # The last record may be cut off by the end of the window
+            records = [record for record in csv.reader(io.StringIO(text, newline=''))][:-1]
+            if records and all(len(record) == len(columns) for record in records):
+                sample_df = pd.read_csv(io.StringIO(text, newline=''), header=None,
+                                        names=columns, nrows=min(len(records), ROWS_PER_STRATUM))
+                return sample_df, (end - start) / (len(records) + 1)
+        return None
+    
+    def sample_strata(self, csv_path, strata=DEFAULT_SAMPLE_STRATA):
+        """
+        Sample rows at evenly spaced byte offsets across the file, reading
+        only a small window at each offset.
+        
+        Parameters:
+        csv_path (str): Path to CSV file
+        strata (int): Number of offsets to sample
+        
+        Returns:
+        list: (DataFrame, raw CSV bytes per row) for each offset where
+              complete records could be found
+        """
+        size = os.path.getsize(csv_path)
+        columns = read_csv_header(csv_path)
+        samples = []
+        
+        # One window already covers a small file
+        if size <= STRATUM_WINDOW_BYTES:
+            strata = 1
+        
+        with open(csv_path, 'rb') as f:
+            for i in range(strata):
+                f.seek(size * i // strata)
+                stratum = self._parse_stratum(f.read(STRATUM_WINDOW_BYTES), columns)
+                if stratum is not None:
+                    samples.append(stratum)
+        return samples
+    
+    def estimate_row_width(self, csv_path, strata=DEFAULT_SAMPLE_STRATA):
+        """
+        Estimate the in-memory width of a row from stratified samples.
+        
+        Each stratum is weighted by the number of rows it stands for (its
+        share of the file divided by its raw bytes per row).
+        
+        Returns:
+        dict: mean, std and cv (std / mean) of the row width in bytes across
+              the file, plus min/max stratum widths and the number of strata
+        """
+        samples = [(df, raw) for df, raw in self.sample_strata(csv_path, strata) if len(df)]
+        if not samples:
+            raise ValueError("no complete records found in the sampled windows")
+        
+        widths = np.array([df.memory_usage(deep=True).sum() / len(df) for df, _ in samples])
+        weights = np.array([1.0 / raw for _, raw in samples])
+        mean = float(np.average(widths, weights=weights))
+        std = float(np.sqrt(np.average((widths - mean) ** 2, weights=weights)))
+        return {
+            'mean': mean,
+            'std': std,
+            'cv': std / mean if mean else 0.0,
+            'min': float(widths.min()),
+            'max': float(widths.max()),
+            'strata': len(samples),
+        }
+    
+    def estimate_rows_per_chunk(self, csv_path, chunk_size_mb, strata=DEFAULT_SAMPLE_STRATA):
         """
         Estimate how many rows should be in each chunk based on file size
         and desired chunk size
+        
+        Rows are sampled from several positions across the file, not just the
+        head. Chunks are sized for the mean row width plus one standard
+        deviation, so the wider parts of an uneven file don't overshoot.
         """
         try:
-            # Read a small sample to estimate row size
-            sample_size = 1000
-            sample_df = pd.read_csv(csv_path, nrows=sample_size, encoding='utf-8', on_bad_lines='skip')
-            
-            # Calculate average row size in bytes
-            sample_memory = sample_df.memory_usage(deep=True).sum()
-            avg_row_size = sample_memory / len(sample_df)
+            stats = self.estimate_row_width(csv_path, strata)
+            self.row_width_stats = stats
+            print(f"Row width over {stats['strata']} strata: mean {stats['mean']:,.0f} B, "
+                  f"std {stats['std']:,.0f} B (cv {stats['cv']:.2f}), "
+                  f"range {stats['min']:,.0f}-{stats['max']:,.0f} B")
             
             # Calculate rows per chunk
+            avg_row_size = min(stats['mean'] + stats['std'], stats['max'])
             target_chunk_size = chunk_size_mb * self.bytes_per_mb
             rows_per_chunk = max(1000, int(target_chunk_size / avg_row_size))
             
@@ -41,19 +383,463 @@ class CSVSplitterConverter:
             # Return a safe default if estimation fails
             return 10000
     
-    def get_total_rows(self, csv_path):
-        """Count total rows in CSV file"""
+    def measure_bytes_per_row(self, csv_path, engine='pandas'):
+        """
+        Measure compressed Parquet bytes per row by trial-encoding the first
+        CALIBRATION_ROWS rows in memory
+        """
+        sample = next(iter_csv_batches(csv_path, CALIBRATION_ROWS, engine=engine,
+                                       skip_bad_lines=True))
+        return encoded_bytes_per_row(sample, self.layout)
+    
+    def get_total_rows(self, csv_path, exact=True):
+        """
+        Count total rows in CSV file
+        
+        Rows are counted from the raw bytes (memory-mapped, vectorized,
+        quote-aware) rather than by parsing. With exact=False only the head
+        of the file is counted and the total is extrapolated from file size.
+        """
         try:
-            # Use pandas to count rows with proper encoding
-            with pd.read_csv(csv_path, encoding='utf-8', chunksize=10000) as reader:
-                total_rows = sum(len(chunk) for chunk in reader)
-            return total_rows
+            if exact:
+                return count_csv_records(csv_path)
+            return estimate_csv_records(csv_path)
         except Exception as e:
             print(f"Warning: Could not count exact rows due to {str(e)}")
             print("Proceeding with chunk-based processing...")
             return None
     
-    def split_and_convert(self, input_csv, output_dir, chunk_size_mb=None):
+    def _report_files(self, created_files, root=None):
+        """Print the size of every created chunk, relative to root if given"""
+        print(f"\nCreated {len(created_files)} files:")
+        for file in created_files:
+            size_mb = os.path.getsize(file) / self.bytes_per_mb
+            name = file.relative_to(root) if root else file.name
+            print(f"- {name}: {size_mb:.2f} MB")
+    
+    def _write_metadata(self, output_dir, created_files):
+        """
+        Write dataset summary files for the chunks, first rewriting chunks
+        whose types are narrower than the rest so none is left out
+        """
+        try:
+            rewritten = _unify_chunk_files(created_files, self.layout)
+            if rewritten:
+                print(f"Rewrote {rewritten} files to the widened schema of the dataset")
+            write_dataset_metadata(output_dir, created_files)
+            print(f"Wrote {output_dir / '_metadata'} and {output_dir / '_common_metadata'}")
+        except Exception as e:
+            print(f"Warning: could not write dataset metadata: {str(e)}")
+    
+    def _iter_sorted(self, input_csv, engine, batch_size, sort_by, sort_memory_mb, temp_dir,
+                     pbar):
+        """Parse the CSV and sort it externally, tracking bytes read in pbar"""
+        def parsed():
+            for table, end_offset in iter_csv_chunks(input_csv, ADAPTIVE_READ_ROWS,
+                                                     engine=engine, skip_bad_lines=True):
+                yield table
+                pbar.update(end_offset - pbar.n)
+        
+        return iter_sorted_batches(parsed(), sort_by, batch_size,
+                                   int(sort_memory_mb * 1024 * 1024), temp_dir)
+    
+    def _split_partitioned(self, input_csv, output_dir, partition_by, rows_per_chunk,
+                           engine='pandas', max_open_partitions=DEFAULT_MAX_OPEN_WRITERS,
+                           sort_by=None, sort_memory_mb=DEFAULT_SORT_MEMORY_MB, temp_dir=None):
+        """
+        Stream the CSV into output_dir/col=value/part-N.parquet files, starting
+        a new part whenever a partition's file reaches rows_per_chunk rows
+        """
+        writer = PartitionedWriter(output_dir, partition_by,
+                                   max_open_writers=max_open_partitions,
+                                   max_rows_per_file=rows_per_chunk, layout=self.layout)
+        pbar = tqdm(total=os.path.getsize(input_csv), unit='B', unit_scale=True,
+                    unit_divisor=1024, desc="Partitioning")
+        try:
+            with pbar:
+                if sort_by:
+                    for table in self._iter_sorted(input_csv, engine, ADAPTIVE_READ_ROWS, sort_by,
+                                                   sort_memory_mb, temp_dir, pbar):
+                        writer.write(table)
+                else:
+                    for table, end_offset in iter_csv_chunks(input_csv, ADAPTIVE_READ_ROWS,
+                                                             engine=engine, skip_bad_lines=True):
+                        writer.write(table)
+                        pbar.update(end_offset - pbar.n)
+        finally:
+            files = writer.close()
+        return [Path(f) for f in files]
+    
+    def _split_sorted(self, input_csv, output_dir, sort_by, rows_per_chunk, engine='pandas',
+                      sort_memory_mb=DEFAULT_SORT_MEMORY_MB, temp_dir=None):
+        """
+        Sort the whole CSV on sort_by and cut the sorted stream into chunks,
+        so each chunk covers a narrow, non-overlapping key range
+        """
+        created_files = []
+        pbar = tqdm(total=os.path.getsize(input_csv), unit='B', unit_scale=True,
+                    unit_divisor=1024, desc="Sorting")
+        with pbar:
+            chunks = self._iter_sorted(input_csv, engine, rows_per_chunk, sort_by,
+                                       sort_memory_mb, temp_dir, pbar)
+            for chunk_num, chunk in enumerate(chunks):
+                output_file = output_dir / f"chunk_{chunk_num:04d}.parquet"
+                tmp_file = output_file.with_name(output_file.name + '.tmp')
+                self.layout.write_table(chunk, tmp_file)
+                os.replace(tmp_file, output_file)
+                created_files.append(output_file)
+                pbar.set_postfix({'Chunks written': len(created_files)}, refresh=False)
+        return created_files
+    
+    def range_boundaries(self, csv_path, key, num_ranges, strata=DEFAULT_SAMPLE_STRATA):
+        """
+        Place boundaries that cut the key column into num_ranges intervals of
+        roughly equal row counts, from weighted quantiles of a stratified sample.
+        
+        Parameters:
+        csv_path (str): Path to CSV file
+        key (str): Column to range-partition on
+        num_ranges (int): Intervals wanted
+        strata (int): Minimum number of positions sampled; more are sampled
+                      for many ranges
+        
+        Returns:
+        tuple: (sorted array of boundaries, bool telling whether keys are numeric).
+               Integer keys give int64 boundaries, so 64-bit ids keep every digit.
+               Interval i holds keys k with boundaries[i-1] <= k < boundaries[i];
+               duplicate boundaries from skewed keys are merged, so there may
+               be fewer intervals than requested
+        """
+        strata = min(max(strata, 4 * num_ranges), MAX_RANGE_SAMPLE_STRATA)
+        samples = [(df, raw) for df, raw in self.sample_strata(csv_path, strata) if len(df)]
+        if not samples:
+            raise ValueError("no complete records found in the sampled windows")
+        if key not in samples[0][0].columns:
+            raise ValueError(f"Range column not found: {key}")
+        
+        # Each sampled row stands for (stratum rows / sampled rows) rows of the file
+        values = pd.concat([df[key] for df, _ in samples], ignore_index=True)
+        weights = np.concatenate([np.full(len(df), 1.0 / (raw * len(df))) for df, raw in samples])
+        numeric = pd.api.types.is_numeric_dtype(values)
+        valid = values.notna().to_numpy()
+        values = values[valid]
+        weights = weights[valid]
+        if pd.api.types.is_integer_dtype(values) or (
+                numeric and len(values) and (values % 1 == 0).all()
+                and values.abs().max() < 2 ** 53):
+            # Integer keys (floats only because of nulls in the sample) stay exact
+            values = values.to_numpy(dtype=np.int64)
+        else:
+            values = values.to_numpy(dtype=float if numeric else str)
+        if not len(values):
+            raise ValueError(f"No non-null values of {key} in the sample")
+        
+        order = np.argsort(values, kind='stable')
+        values = values[order]
+        cumulative = np.cumsum(weights[order])
+        cumulative /= cumulative[-1]
+        picks = np.searchsorted(cumulative, np.arange(1, num_ranges) / num_ranges)
+        boundaries = np.unique(values[np.minimum(picks, len(values) - 1)])
+        
+        # Nothing can fall below the smallest key, so it would only open an empty first range
+        return boundaries[boundaries > values[0]], numeric
+    
+    def _route_to_ranges(self, table, key, boundaries, numeric):
+        """Range index of every row, with -1 for null keys"""
+        column = table.column(key)
+        if numeric and boundaries.dtype.kind == 'i':
+            valid = column.is_valid().to_numpy(zero_copy_only=False)
+            try:
+                keys = column.cast(pa.int64()).fill_null(0).to_numpy(zero_copy_only=False)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                # Fractional values after all; compare as floats
+                boundaries = boundaries.astype(float)
+        if numeric and boundaries.dtype.kind != 'i':
+            try:
+                keys = column.cast(pa.float64()).to_numpy(zero_copy_only=False)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                raise ValueError(f"Non-numeric values in range column {key}")
+            valid = ~np.isnan(keys)
+        elif not numeric:
+            keys = column.cast(pa.string()).to_numpy(zero_copy_only=False)
+            valid = column.is_valid().to_numpy(zero_copy_only=False)
+        
+        ranges = np.full(len(keys), -1)
+        ranges[valid] = np.searchsorted(boundaries, keys[valid].astype(boundaries.dtype),
+                                        side='right')
+        return ranges, keys, valid
+    
+    def _split_by_range(self, input_csv, output_dir, key, num_ranges, engine='pandas',
+                        strata=DEFAULT_SAMPLE_STRATA, max_open_partitions=DEFAULT_MAX_OPEN_WRITERS):
+        """
+        Route every row to the chunk owning its key interval and record the
+        intervals in RANGE_INDEX_NAME. Null keys go to a chunk of their own.
+        """
+        boundaries, numeric = self.range_boundaries(input_csv, key, num_ranges, strata)
+        print(f"Range boundaries on {key}: {len(boundaries) + 1} ranges")
+        
+        names = [f"chunk_{i:04d}" for i in range(len(boundaries) + 1)]
+        stats = {}  # range index -> [rows, min key, max key]
+        writer = PartitionedWriter(output_dir, [], max_open_writers=max_open_partitions,
+                                   max_partition_bytes=min(self.chunk_size_mb * self.bytes_per_mb,
+                                                           64 * self.bytes_per_mb),
+                                   file_template='{partition}_part{number:03d}.parquet',
+                                   layout=self.layout)
+        pbar = tqdm(total=os.path.getsize(input_csv), unit='B', unit_scale=True,
+                    unit_divisor=1024, desc="Routing")
+        try:
+            with pbar:
+                for table, end_offset in iter_csv_chunks(input_csv, ADAPTIVE_READ_ROWS,
+                                                         engine=engine, skip_bad_lines=True):
+                    ranges, keys, valid = self._route_to_ranges(table, key, boundaries, numeric)
+                    for index, positions in _group_positions(ranges):
+                        writer.write_partition('chunk_null' if index < 0 else names[index],
+                                               table.take(pa.array(positions)))
+                        entry = stats.setdefault(index, [0, None, None])
+                        entry[0] += len(positions)
+                        if index >= 0:
+                            low, high = keys[positions].min(), keys[positions].max()
+                            entry[1] = low if entry[1] is None else min(entry[1], low)
+                            entry[2] = high if entry[2] is None else max(entry[2], high)
+                    pbar.update(end_offset - pbar.n)
+        finally:
+            writer.close()
+        
+        def to_json(value):
+            if value is None:
+                return None
+            value = value.item() if hasattr(value, 'item') else value
+            return int(value) if isinstance(value, float) and value.is_integer() else value
+        
+        index_entries = []
+        for index in sorted(stats, key=lambda i: (i < 0, i)):
+            rows, low, high = stats[index]
+            name = 'chunk_null' if index < 0 else names[index]
+            index_entries.append({
+                'files': [Path(f).name for f in writer.partition_files.get(name, [])],
+                'lower': to_json(boundaries[index - 1]) if index > 0 else None,
+                'upper': to_json(boundaries[index]) if 0 <= index < len(boundaries) else None,
+                'nulls': index < 0,
+                'rows': rows,
+                'min': to_json(low),
+                'max': to_json(high),
+            })
+        
+        index_path = output_dir / RANGE_INDEX_NAME
+        tmp_path = index_path.with_name(index_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'column': key, 'lower_inclusive': True, 'ranges': index_entries}, f, indent=2)
+        os.replace(tmp_path, index_path)
+        print(f"Wrote key ranges to {index_path}")
+        
+        return sorted(Path(f) for f in writer.files)
+    
+    def _split_by_bucket(self, input_csv, output_dir, key, buckets, engine='pandas',
+                         max_open_partitions=DEFAULT_MAX_OPEN_WRITERS):
+        """
+        Route every row to one of buckets files by a stable hash of its key in
+        a single pass, and record the bucket files in BUCKET_INDEX_NAME
+        """
+        names = [f"bucket_{i:05d}" for i in range(buckets)]
+        rows = [0] * buckets
+        writer = PartitionedWriter(output_dir, [], max_open_writers=max_open_partitions,
+                                   max_partition_bytes=min(self.chunk_size_mb * self.bytes_per_mb,
+                                                           64 * self.bytes_per_mb),
+                                   file_template='{partition}_part{number:03d}.parquet',
+                                   layout=self.layout)
+        pbar = tqdm(total=os.path.getsize(input_csv), unit='B', unit_scale=True,
+                    unit_divisor=1024, desc="Bucketing")
+        try:
+            with pbar:
+                for table, end_offset in iter_csv_chunks(input_csv, ADAPTIVE_READ_ROWS,
+                                                         engine=engine, skip_bad_lines=True):
+                    if key not in table.column_names:
+                        raise ValueError(f"Bucket column not found: {key}")
+                    for index, positions in _group_positions(bucket_indices(table.column(key),
+                                                                            buckets)):
+                        writer.write_partition(names[index], table.take(pa.array(positions)))
+                        rows[index] += len(positions)
+                    pbar.update(end_offset - pbar.n)
+        finally:
+            writer.close()
+        
+        index_path = output_dir / BUCKET_INDEX_NAME
+        tmp_path = index_path.with_name(index_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'column': key, 'buckets': buckets,
+                       'hash': 'pandas.util.hash_array(str(value)) % buckets',
+                       'files': [[Path(p).name for p in writer.partition_files.get(name, [])]
+                                 for name in names],
+                       'rows': rows}, f, indent=2)
+        os.replace(tmp_path, index_path)
+        print(f"Wrote bucket index to {index_path}")
+        
+        return sorted(Path(f) for f in writer.files)
+    
+    def _split_parallel(self, input_csv, output_dir, rows_per_chunk, engine, workers,
+                        controller=None, schema=None):
+        """
+        Cut the CSV into record-aligned byte ranges and split each range in
+        its own process. Chunks are numbered in file order once all ranges
+        are done; each range ends with its own (possibly short) chunk. With a
+        schema every chunk is cast to it.
+        """
+        ranges = split_byte_ranges(input_csv, workers)
+        range_chunks = [None] * len(ranges)
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(_convert_range_to_chunks, input_csv, byte_range,
+                                str(output_dir), rows_per_chunk, engine,
+                                controller.target_bytes if controller else None,
+                                self.layout, schema): i
+                for i, byte_range in enumerate(ranges)
+            }
+            try:
+                for future in tqdm(as_completed(futures), total=len(futures),
+                                   desc="Converting ranges"):
+                    range_chunks[futures[future]] = future.result()
+            except Exception:
+                for chunks in range_chunks:
+                    for tmp_file in chunks or []:
+                        os.remove(tmp_file)
+                raise
+        
+        created_files = []
+        for tmp_file in (tmp for chunks in range_chunks for tmp in chunks):
+            output_file = output_dir / f"chunk_{len(created_files):04d}.parquet"
+            os.replace(tmp_file, output_file)
+            created_files.append(output_file)
+        return created_files
+    
+    def _clear_chunks(self, output_dir):
+        """
+        Remove the chunk files, checkpoint and summaries an earlier run left in
+        output_dir, so a fresh run cannot mix its chunks with stale ones
+        """
+        stale = list(output_dir.glob('chunk_[0-9]*.parquet'))
+        stale += output_dir.glob('chunk_[0-9]*.parquet.tmp')
+        stale += [output_dir / name for name in (CHECKPOINT_NAME, '_metadata', '_common_metadata')]
+        for path in stale:
+            if path.exists():
+                os.remove(path)
+    
+    def _new_checkpoint(self, input_csv, options):
+        """Fresh checkpoint state for splitting input_csv from the start"""
+        stat = os.stat(input_csv)
+        return {
+            'input': os.path.abspath(input_csv),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'options': options,
+            # The codec compression='auto' chose, reused when resuming
+            'codec': [self.layout.compression, self.layout.compression_level],
+            'offset': None,
+            'chunks': 0,
+            'rows': 0,
+            'files': [],
+            'complete': False,
+        }
+    
+    def _load_checkpoint(self, checkpoint_path, input_csv, options):
+        """
+        Load the checkpoint of an earlier run on the same, unchanged input
+        with the same options. Returns None (start over) if there is none or
+        it doesn't match.
+        """
+        try:
+            with open(checkpoint_path, encoding='utf-8') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            print("No checkpoint found, starting from the beginning")
+            return None
+        except ValueError as e:
+            print(f"Warning: unreadable checkpoint ({str(e)}), starting from the beginning")
+            return None
+        
+        stat = os.stat(input_csv)
+        if (state.get('input') != os.path.abspath(input_csv) or state.get('size') != stat.st_size
+                or state.get('mtime_ns') != stat.st_mtime_ns):
+            print("Warning: checkpoint is for a different or modified input, starting from the beginning")
+            return None
+        if state.get('options') != options:
+            print(f"Warning: checkpoint was written with different options ({state.get('options')}), "
+                  f"starting from the beginning")
+            return None
+        return state
+    
+    def _save_checkpoint(self, checkpoint_path, state):
+        """Write checkpoint state atomically"""
+        tmp_path = checkpoint_path.with_name(checkpoint_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, checkpoint_path)
+    
+    def _write_chunks_pipelined(self, chunks, output_dir, on_written, encode_workers,
+                                queue_depth=DEFAULT_QUEUE_DEPTH, first_chunk=0):
+        """
+        Write chunks with parsing, encoding and writing overlapped.
+        
+        The calling thread parses and hands each chunk to a pool of encode
+        workers, which build the compressed Parquet file in memory. A writer
+        thread takes the encoded chunks in their original order and writes
+        them to disk. The queue between them holds at most queue_depth
+        chunks, so the reader blocks instead of running ahead of the disk.
+        
+        chunks yields (table, end offset) pairs; on_written is called from the
+        writer thread after each chunk is committed.
+        """
+        write_queue = queue.Queue(maxsize=queue_depth)
+        failures = []
+        
+        def writer():
+            while True:
+                item = write_queue.get()
+                if item is None:
+                    return
+                if failures:
+                    # Drain what is left after an error
+                    continue
+                output_file, rows, end_offset, encoded = item
+                try:
+                    data = encoded.result()
+                    tmp_file = output_file.with_name(output_file.name + '.tmp')
+                    with open(tmp_file, 'wb') as f:
+                        f.write(data)
+                    os.replace(tmp_file, output_file)
+                    on_written(output_file, rows, data.size, end_offset)
+                except Exception as e:
+                    failures.append(e)
+        
+        writer_thread = threading.Thread(target=writer, name='chunk-writer', daemon=True)
+        writer_thread.start()
+        try:
+            with ThreadPoolExecutor(max_workers=encode_workers) as encoders:
+                for chunk_num, (chunk, end_offset) in enumerate(chunks, first_chunk):
+                    if failures:
+                        break
+                    output_file = output_dir / f"chunk_{chunk_num:04d}.parquet"
+                    write_queue.put((output_file, chunk.num_rows, end_offset,
+                                     encoders.submit(_encode_parquet, chunk, self.layout)))
+        finally:
+            write_queue.put(None)
+            writer_thread.join()
+        
+        if failures:
+            raise failures[0]
+    
+    def split_and_convert(self, input_csv, output_dir, chunk_size_mb=None, engine='pandas',
+                          workers=1, exact_row_count=True, single_pass=False,
+                          adaptive_chunks=False, sample_strata=DEFAULT_SAMPLE_STRATA,
+                          pipeline_workers=0, queue_depth=DEFAULT_QUEUE_DEPTH, resume=False,
+                          write_metadata=False, partition_by=None,
+                          max_open_partitions=DEFAULT_MAX_OPEN_WRITERS, sort_by=None,
+                          sort_memory_mb=DEFAULT_SORT_MEMORY_MB, temp_dir=None,
+                          range_by=None, num_ranges=None, bucket_by=None, buckets=None,
+                          row_group_size=None, data_page_size=None,
+                          dictionary_pagesize_limit=None,
+                          target_row_group_mb=DEFAULT_ROW_GROUP_MB, compression=None,
+                          compression_level=None, compression_objective='size'):
         """
         Split large CSV file into smaller chunks and convert to Parquet
         
@@ -61,70 +847,284 @@ class CSVSplitterConverter:
         input_csv (str): Path to input CSV file
         output_dir (str): Directory to save output files
         chunk_size_mb (float): Optional override for chunk size in MB
+        engine (str): CSV parsing engine, 'pandas' or 'arrow'. The arrow engine
+                      writes Arrow tables straight to Parquet without pandas
+        workers (int): Parse the file as this many quote-aware byte ranges in
+                       parallel processes
+        exact_row_count (bool): Count every row up front for the progress bar;
+                                when False the count is extrapolated from a sample
+        single_pass (bool): Skip the row count entirely and report progress as
+                            bytes consumed from the input, with MB/s and ETA
+        adaptive_chunks (bool): Treat the chunk size as the on-disk size of each
+                                Parquet file: rows per chunk start from a trial
+                                encoding and are corrected after every chunk
+                                from its measured compressed bytes per row
+        sample_strata (int): Number of evenly spaced positions sampled to
+                             estimate the row width
+        pipeline_workers (int): When set, overlap parsing, encoding and writing:
+                                this many threads encode chunks while the next
+                                ones are parsed and earlier ones are written
+        queue_depth (int): Encoded chunks allowed to wait for the writer in
+                           pipelined mode, which bounds memory use
+        resume (bool): Continue an interrupted run from the last committed
+                       chunk recorded in the checkpoint file in output_dir.
+                       Chunks are always written under temporary names and
+                       committed atomically, with a checkpoint after each one
+        write_metadata (bool): Write _metadata and _common_metadata summary
+                               files aggregating the row groups of all chunks.
+                               Chunks are cast to a schema inferred from samples
+                               of the whole file, widened (and earlier chunks
+                               rewritten) where a chunk needs wider types
+        partition_by (list): Write a Hive-style layout, output_dir/col=value/
+                             part-N.parquet, instead of chunk_NNNN files. The
+                             chunk size caps each part file; workers, resume and
+                             pipelining do not apply in this mode
+        max_open_partitions (int): Partition files kept open at once; the least
+                                   recently used one is closed beyond this
+        sort_by (list): Sort all rows on these columns before splitting (an
+                        external merge sort spilling runs to temp_dir), so
+                        chunks and their row groups cover disjoint key ranges.
+                        Workers, resume and pipelining do not apply
+        sort_memory_mb (float): Memory for each in-memory sorted run
+        temp_dir (str): Directory for spilled runs (system temp directory by default)
+        range_by (str): Range-partition on this column instead of splitting by
+                        row position: boundaries come from quantiles of a
+                        stratified sample and each chunk holds one disjoint
+                        key interval, recorded in _ranges.json
+        num_ranges (int): Number of key ranges; by default the estimated row
+                          count divided by the rows per chunk
+        bucket_by (str): Hash-bucket on this column instead: every row goes to
+                         bucket hash(str(key)) % buckets, so two extracts
+                         bucketed the same way can be joined bucket by bucket
+        buckets (int): Number of buckets; by default the estimated row count
+                       divided by the rows per chunk
+        row_group_size (int or str): Rows per row group in every output file,
+                                     or 'auto' to size row groups to
+                                     target_row_group_mb of uncompressed data
+        data_page_size (int): Target data page size in bytes
+        dictionary_pagesize_limit (int): Dictionary page size limit in bytes
+        target_row_group_mb (float): Uncompressed row group size in 'auto' mode
+        compression (str): Codec for every chunk, one of COMPRESSIONS, or
+                           'auto' to benchmark the codecs on the head of the
+                           file and use the best for compression_objective
+        compression_level (int): Codec level (zstd, lz4, gzip, brotli)
+        compression_objective (str): 'size', 'write' or 'read' for compression='auto'
         
         Returns:
         list: Paths to created Parquet files
         """
+        validate_engine(engine)
+        
         if chunk_size_mb is not None:
             self.chunk_size_mb = float(chunk_size_mb)
+        self.layout = ParquetLayout(row_group_size, data_page_size, dictionary_pagesize_limit,
+                                    target_row_group_mb, compression, compression_level,
+                                    compression_objective)
+        # Everything that shapes the chunks; a checkpoint is only resumed with the same
+        checkpoint_options = {'chunk_size_mb': self.chunk_size_mb, 'engine': engine,
+                              'adaptive_chunks': adaptive_chunks,
+                              'write_metadata': write_metadata,
+                              'layout': self.layout.options()}
+        if self.layout.compression == 'auto':
+            self.layout.resolve_compression(read_csv_sample(input_csv, engine))
             
         # Create output directory if it doesn't exist
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Get total rows and calculate chunks
-        total_rows = self.get_total_rows(input_csv)
-        rows_per_chunk = self.estimate_rows_per_chunk(input_csv, self.chunk_size_mb)
+        controller = None
+        if adaptive_chunks:
+            controller = ChunkSizeController(self.chunk_size_mb * self.bytes_per_mb,
+                                             self.measure_bytes_per_row(input_csv, engine),
+                                             layout=self.layout)
+            rows_per_chunk = controller.rows_per_chunk
+        else:
+            rows_per_chunk = self.estimate_rows_per_chunk(input_csv, self.chunk_size_mb,
+                                                          sample_strata)
+        
+        if partition_by:
+            print(f"Partitioning {input_csv} by {', '.join(partition_by)}")
+            print(f"Maximum rows per part file: {rows_per_chunk:,}")
+            try:
+                created_files = self._split_partitioned(input_csv, output_dir, partition_by,
+                                                        rows_per_chunk, engine,
+                                                        max_open_partitions, sort_by,
+                                                        sort_memory_mb, temp_dir)
+            except Exception as e:
+                print(f"Error during conversion: {str(e)}")
+                return []
+            self._report_files(created_files, output_dir)
+            if write_metadata:
+                self._write_metadata(output_dir, created_files)
+            return created_files
+        
+        if bucket_by:
+            if buckets is None:
+                total_rows = self.get_total_rows(input_csv, exact=False) or rows_per_chunk
+                buckets = max(1, math.ceil(total_rows / rows_per_chunk))
+            print(f"Bucketing {input_csv} by {bucket_by} into {buckets} buckets")
+            try:
+                created_files = self._split_by_bucket(input_csv, output_dir, bucket_by, buckets,
+                                                      engine, max_open_partitions)
+            except Exception as e:
+                print(f"Error during conversion: {str(e)}")
+                return []
+            self._report_files(created_files)
+            if write_metadata:
+                self._write_metadata(output_dir, created_files)
+            return created_files
+        
+        if range_by:
+            if num_ranges is None:
+                total_rows = self.get_total_rows(input_csv, exact=False) or rows_per_chunk
+                num_ranges = max(1, math.ceil(total_rows / rows_per_chunk))
+            print(f"Range-partitioning {input_csv} by {range_by} into up to {num_ranges} ranges")
+            try:
+                created_files = self._split_by_range(input_csv, output_dir, range_by, num_ranges,
+                                                     engine, sample_strata, max_open_partitions)
+            except Exception as e:
+                print(f"Error during conversion: {str(e)}")
+                return []
+            self._report_files(created_files)
+            if write_metadata:
+                self._write_metadata(output_dir, created_files)
+            return created_files
+        
+        if sort_by:
+            print(f"Sorting {input_csv} by {', '.join(sort_by)}")
+            print(f"Estimated rows per chunk: {rows_per_chunk:,}")
+            self._clear_chunks(output_dir)
+            try:
+                created_files = self._split_sorted(input_csv, output_dir, sort_by, rows_per_chunk,
+                                                   engine, sort_memory_mb, temp_dir)
+            except Exception as e:
+                print(f"Error during conversion: {str(e)}")
+                return []
+            self._report_files(created_files)
+            if write_metadata:
+                self._write_metadata(output_dir, created_files)
+            return created_files
         
-        if total_rows:
-            total_chunks = math.ceil(total_rows / rows_per_chunk)
-            print(f"\nTotal rows: {total_rows:,}")
+        if workers and workers > 1 and resume:
+            print("Resuming is only supported for sequential splitting, ignoring --workers")
+            workers = 1
+        
+        if workers and workers > 1:
+            print(f"Processing {input_csv} in {workers} parallel ranges")
+            print(f"Estimated rows per chunk: {rows_per_chunk:,}")
+            self._clear_chunks(output_dir)
+            try:
+                schema = infer_csv_schema(input_csv, engine) if write_metadata else None
+                created_files = self._split_parallel(input_csv, output_dir, rows_per_chunk,
+                                                     engine, workers, controller, schema)
+            except Exception as e:
+                print(f"Error during conversion: {str(e)}")
+                return []
+            self._report_files(created_files)
+            if write_metadata:
+                self._write_metadata(output_dir, created_files)
+            return created_files
+        
+        checkpoint_path = output_dir / CHECKPOINT_NAME
+        state = (self._load_checkpoint(checkpoint_path, input_csv, checkpoint_options)
+                 if resume else None)
+        if state is None:
+            self._clear_chunks(output_dir)
+            state = self._new_checkpoint(input_csv, checkpoint_options)
+        elif state['complete']:
+            print(f"Already complete according to {checkpoint_path}")
+            return [output_dir / name for name in state['files']]
         else:
-            total_chunks = None
-            print("\nProcessing in chunks (total rows unknown)")
+            print(f"Resuming at chunk {state['chunks']} (byte {state['offset']:,}, "
+                  f"{state['rows']:,} rows already written)")
+            # Keep the codec the interrupted run chose, whatever a new benchmark says
+            self.layout.compression, self.layout.compression_level = state['codec']
+        
+        created_files = [output_dir / name for name in state['files']]
+        
+        total_chunks = None
+        if single_pass:
+            print(f"\nProcessing {input_csv} in a single pass")
+        else:
+            # Get total rows and calculate chunks
+            total_rows = self.get_total_rows(input_csv, exact=exact_row_count)
+            
+            if total_rows:
+                total_chunks = math.ceil(total_rows / rows_per_chunk)
+                if exact_row_count:
+                    print(f"\nTotal rows: {total_rows:,}")
+                else:
+                    print(f"\nEstimated total rows: ~{total_rows:,}")
+            else:
+                print("\nProcessing in chunks (total rows unknown)")
+            print(f"Processing {input_csv}")
             
-        print(f"Processing {input_csv}")
         print(f"Estimated rows per chunk: {rows_per_chunk:,}")
         if total_chunks:
             print(f"Expected number of chunks: {total_chunks}")
         
-        created_files = []
-        
         try:
-            # Process the file in chunks
-            chunk_iterator = pd.read_csv(
-                input_csv,
-                chunksize=rows_per_chunk,
-                encoding='utf-8',
-                on_bad_lines='skip',
-                iterator=True
-            )
+            # Process the file in chunks, each ending at a known byte offset
+            rows = (lambda: controller.rows_per_chunk) if controller else rows_per_chunk
+            chunk_iterator = iter_csv_chunks(input_csv, rows, engine=engine, skip_bad_lines=True,
+                                             start=state['offset'])
+            if write_metadata:
+                chunk_iterator = _conform_chunks(chunk_iterator,
+                                                 infer_csv_schema(input_csv, engine))
             
-            # Use tqdm with or without total
-            pbar = tqdm(chunk_iterator, total=total_chunks if total_chunks else None, 
-                       desc="Converting chunks")
+            # Track bytes consumed (with MB/s and ETA) or chunks written
+            if single_pass:
+                pbar = tqdm(total=os.path.getsize(input_csv), initial=state['offset'] or 0,
+                            unit='B', unit_scale=True, unit_divisor=1024, desc="Converting")
+            else:
+                pbar = tqdm(total=total_chunks if total_chunks else None,
+                            initial=state['chunks'], desc="Converting chunks")
             
-            for chunk_num, chunk in enumerate(pbar):
-                # Generate output filename
-                output_file = output_dir / f"chunk_{chunk_num:04d}.parquet"
-                
-                # Convert chunk to parquet
-                chunk.to_parquet(output_file, index=False)
+            def on_written(output_file, rows, chunk_bytes, end_offset):
                 created_files.append(output_file)
                 
+                # Record the committed chunk so a later run can resume after it
+                state['files'].append(output_file.name)
+                state['chunks'] += 1
+                state['rows'] += rows
+                state['offset'] = end_offset
+                self._save_checkpoint(checkpoint_path, state)
+                
                 # Calculate and display actual chunk size
-                chunk_size = os.path.getsize(output_file) / self.bytes_per_mb
-                pbar.set_postfix({'Current chunk size': f'{chunk_size:.2f}MB'})
+                if controller is not None:
+                    controller.update(rows, chunk_bytes)
+                chunk_size = chunk_bytes / self.bytes_per_mb
+                pbar.set_postfix({'Current chunk size': f'{chunk_size:.2f}MB'}, refresh=False)
+                pbar.update(end_offset - pbar.n if single_pass else 1)
             
-            print(f"\nCreated {len(created_files)} files:")
-            for file in created_files:
-                size_mb = os.path.getsize(file) / self.bytes_per_mb
-                print(f"- {file.name}: {size_mb:.2f} MB")
-                
+            with pbar:
+                if pipeline_workers:
+                    self._write_chunks_pipelined(chunk_iterator, output_dir, on_written,
+                                                 pipeline_workers, queue_depth,
+                                                 first_chunk=state['chunks'])
+                else:
+                    for chunk_num, (chunk, end_offset) in enumerate(chunk_iterator, state['chunks']):
+                        # Generate output filename
+                        output_file = output_dir / f"chunk_{chunk_num:04d}.parquet"
+                        
+                        # Convert chunk to parquet under a temporary name, then commit
+                        tmp_file = output_file.with_name(output_file.name + '.tmp')
+                        self.layout.write_table(chunk, tmp_file)
+                        os.replace(tmp_file, output_file)
+                        on_written(output_file, chunk.num_rows, os.path.getsize(output_file),
+                                   end_offset)
+            
+            state['complete'] = True
+            self._save_checkpoint(checkpoint_path, state)
+            
+            self._report_files(created_files)
+            if write_metadata:
+                self._write_metadata(output_dir, created_files)
             return created_files
             
         except Exception as e:
             print(f"Error during conversion: {str(e)}")
+            print(f"Committed chunks are recorded in {checkpoint_path}; rerun with resume to continue")
             return created_files
 
 def main():
@@ -135,11 +1135,89 @@ def main():
     parser.add_argument('output_dir', help='Directory to save output files')
     parser.add_argument('--chunk-size', type=float, default=250.0,
                       help='Target size for each chunk in megabytes (default: 250.0)')
+    parser.add_argument('--engine', choices=ENGINES, default='pandas',
+                      help='CSV parsing engine (default: pandas)')
+    parser.add_argument('--workers', type=int, default=1,
+                      help='Parse the file as this many byte ranges in parallel (default: 1)')
+    parser.add_argument('--estimate-rows', action='store_true',
+                      help='Extrapolate the row count from a sample instead of counting every row')
+    parser.add_argument('--adaptive', action='store_true',
+                      help='Size chunks by their actual on-disk Parquet size, adjusting after every chunk')
+    parser.add_argument('--sample-strata', type=int, default=DEFAULT_SAMPLE_STRATA,
+                      help=f'Positions sampled across the file to estimate row width '
+                           f'(default: {DEFAULT_SAMPLE_STRATA})')
+    parser.add_argument('--pipeline', type=int, default=0, metavar='N',
+                      help='Overlap parsing, encoding (N threads) and writing')
+    parser.add_argument('--queue-depth', type=int, default=DEFAULT_QUEUE_DEPTH,
+                      help=f'Encoded chunks buffered ahead of the writer in pipelined mode '
+                           f'(default: {DEFAULT_QUEUE_DEPTH})')
+    parser.add_argument('--write-metadata', action='store_true',
+                      help='Write _metadata/_common_metadata summaries of all chunks')
+    parser.add_argument('--partition-by', nargs='+', metavar='COLUMN',
+                      help='Write a Hive-partitioned layout (col=value/part-N.parquet) keyed on these columns')
+    parser.add_argument('--max-open-partitions', type=int, default=DEFAULT_MAX_OPEN_WRITERS,
+                      help=f'Partition files kept open at once (default: {DEFAULT_MAX_OPEN_WRITERS})')
+    parser.add_argument('--sort-by', nargs='+', metavar='COLUMN',
+                      help='Sort all rows on these columns before splitting (external merge sort)')
+    parser.add_argument('--sort-memory', type=float, default=DEFAULT_SORT_MEMORY_MB,
+                      help=f'Memory in MB for each sorted run before spilling (default: {DEFAULT_SORT_MEMORY_MB})')
+    parser.add_argument('--temp-dir', help='Directory for spilled sort runs')
+    parser.add_argument('--range-by', metavar='COLUMN',
+                      help='Give each chunk a disjoint interval of this column, from sampled quantiles')
+    parser.add_argument('--ranges', type=int,
+                      help='Number of key ranges for --range-by (default: from the chunk size)')
+    parser.add_argument('--bucket-by', metavar='COLUMN',
+                      help='Route rows to buckets by a stable hash of this column')
+    parser.add_argument('--buckets', type=int,
+                      help='Number of buckets for --bucket-by (default: from the chunk size)')
+    parser.add_argument('--row-group-size', type=parse_row_group_size,
+                      help="Rows per row group, or 'auto' to size row groups by --row-group-mb")
+    parser.add_argument('--row-group-mb', type=float, default=DEFAULT_ROW_GROUP_MB,
+                      help=f'Uncompressed row group size for --row-group-size auto '
+                           f'(default: {DEFAULT_ROW_GROUP_MB})')
+    parser.add_argument('--data-page-size', type=int, help='Target data page size in bytes')
+    parser.add_argument('--dictionary-pagesize-limit', type=int,
+                      help='Dictionary page size limit in bytes')
+    parser.add_argument('--compression', choices=COMPRESSIONS + ('auto',),
+                      help='Parquet codec, or auto to benchmark codecs on a sample (default: snappy)')
+    parser.add_argument('--compression-level', type=int,
+                      help='Codec level for zstd, lz4, gzip or brotli')
+    parser.add_argument('--compression-objective', choices=COMPRESSION_OBJECTIVES, default='size',
+                      help='What --compression auto optimizes (default: size)')
+    parser.add_argument('--resume', action='store_true',
+                      help='Continue an interrupted split from its last committed chunk')
+    parser.add_argument('--single-pass', action='store_true',
+                      help='Skip the row count and show progress by bytes read')
     
     args = parser.parse_args()
     
     splitter = CSVSplitterConverter(chunk_size_mb=args.chunk_size)
-    splitter.split_and_convert(args.input_csv, args.output_dir)
+    splitter.split_and_convert(args.input_csv, args.output_dir, engine=args.engine,
+                               workers=args.workers,
+                               exact_row_count=not args.estimate_rows,
+                               single_pass=args.single_pass,
+                               adaptive_chunks=args.adaptive,
+                               sample_strata=args.sample_strata,
+                               pipeline_workers=args.pipeline,
+                               queue_depth=args.queue_depth,
+                               resume=args.resume,
+                               write_metadata=args.write_metadata,
+                               partition_by=args.partition_by,
+                               max_open_partitions=args.max_open_partitions,
+                               sort_by=args.sort_by,
+                               sort_memory_mb=args.sort_memory,
+                               temp_dir=args.temp_dir,
+                               range_by=args.range_by,
+                               num_ranges=args.ranges,
+                               bucket_by=args.bucket_by,
+                               buckets=args.buckets,
+                               row_group_size=args.row_group_size,
+                               data_page_size=args.data_page_size,
+                               dictionary_pagesize_limit=args.dictionary_pagesize_limit,
+                               target_row_group_mb=args.row_group_mb,
+                               compression=args.compression,
+                               compression_level=args.compression_level,
+                               compression_objective=args.compression_objective)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,9 +1,1497 @@
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import os
+import io
+import mmap
+import csv
+import math
+import time
+import heapq
+import json
+import hashlib
+import shutil
+import sys
+import tempfile
+from collections import OrderedDict
 from pathlib import Path
+from urllib.parse import quote
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 import argparse
 
-def convert_csv_to_parquet(input_path, output_path=None):
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+DEFAULT_BATCH_SIZE = 100000
+ENGINES = ('pandas', 'arrow')
+
+# Bytes handed to each Arrow CSV parse task; types are inferred from the first block
+ARROW_BLOCK_SIZE = 16 * 1024 * 1024
+
+# Block size used when scanning raw bytes for record boundaries
+SCAN_BLOCK_SIZE = 16 * 1024 * 1024
+
+# Bytes read from the head of a file when row counts are extrapolated
+ROW_COUNT_SAMPLE_BYTES = 8 * 1024 * 1024
+
+# Files are never cut into byte ranges smaller than this in parallel batches
+MIN_RANGE_BYTES = 64 * 1024 * 1024
+
+# Samples spread across a file, and bytes parsed per sample, when column
+# types are inferred before a streaming conversion
+SCHEMA_SAMPLE_RANGES = 16
+SCHEMA_SAMPLE_BYTES = 1024 * 1024
+
+# Piece size of a full schema scan; each piece fits one Arrow block so its
+# types are inferred from all of its rows
+SCHEMA_SCAN_BYTES = ARROW_BLOCK_SIZE // 2
+
+# Bytes converted up front to estimate throughput for makespan prediction
+CALIBRATION_BYTES = 4 * 1024 * 1024
+
+# Change-tracking manifest kept in the output root by incremental batches
+MANIFEST_NAME = '.csv_to_parquet_manifest.json'
+
+# Default size limit of the conversion cache
+DEFAULT_CACHE_SIZE_MB = 10 * 1024
+
+# Rows held in memory by an external sort before a sorted run is spilled to disk
+DEFAULT_SORT_MEMORY_MB = 512
+
+# Uncompressed size aimed for per row group when the row group size is 'auto'
+DEFAULT_ROW_GROUP_MB = 128
+
+# Codecs accepted by --compression ('none' writes uncompressed pages)
+COMPRESSIONS = ('snappy', 'zstd', 'lz4', 'gzip', 'brotli', 'none')
+
+# What compression='auto' optimizes for: file size, write speed or read speed
+COMPRESSION_OBJECTIVES = ('size', 'write', 'read')
+
+# (codec, level) pairs trial-encoded by compression='auto'; None is the codec's default level
+AUTO_COMPRESSION_CANDIDATES = (('snappy', None), ('lz4', None), ('zstd', None), ('zstd', 9),
+                               ('gzip', None), ('brotli', None), ('none', None))
+
+# Timed encodings per candidate in the codec benchmark; the fastest is kept
+BENCHMARK_REPEATS = 3
+
+# Partition files kept open at once when writing Hive-style partitioned output
+DEFAULT_MAX_OPEN_WRITERS = 64
+
+# Rows buffered per partition before they are flushed to its file as a row group
+DEFAULT_PARTITION_BUFFER_MB = 64
+
+# Rows buffered across all partitions; the largest buffers are flushed beyond it
+DEFAULT_TOTAL_BUFFER_MB = 1024
+
+# Directory name Hive uses for null partition values
+HIVE_NULL_PARTITION = '__HIVE_DEFAULT_PARTITION__'
+
+def conform_to_schema(table, schema):
+    """
+    Cast a batch to the schema of the batches already written.
+    
+    Type inference runs per batch, so a later batch can come back with a
+    different type (e.g. an int column that now contains nulls). Parquet
+    files have a single schema, so every batch is cast to it.
+    """
+    if table.schema.equals(schema, check_metadata=False):
+        if table.schema.metadata != schema.metadata:
+            # e.g. pandas dtypes of a batch parsed with pinned types
+            table = table.replace_schema_metadata(schema.metadata)
+        return table
+    
+    try:
+        return table.select(schema.names).cast(schema)
+    except (KeyError, pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+        raise ValueError(f"Batch does not match the schema of the rest of the file ({str(e)})")
+
+def unify_schemas(schemas):
+    """
+    Merge the schemas of independently parsed pieces of one CSV file.
+    
+    Types that disagree are widened (int64 + double -> double, null -> any);
+    columns whose types cannot be reconciled fall back to string.
+    """
+    try:
+        return pa.unify_schemas(schemas, promote_options='permissive')
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        pass
+    
+    fields = []
+    for field in schemas[0]:
+        single = [pa.schema([schema.field(field.name)]) for schema in schemas]
+        try:
+            fields.append(pa.unify_schemas(single, promote_options='permissive').field(0))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            fields.append(pa.field(field.name, pa.string()))
+    return pa.schema(fields, metadata=schemas[0].metadata)
+
+def validate_engine(engine):
+    """Raise ValueError if engine is not a supported CSV parsing engine"""
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}', expected one of: {', '.join(ENGINES)}")
+
+def pandas_dtypes(schema):
+    """
+    read_csv dtype= mapping that pins the integer, float, boolean and string
+    columns of schema; other columns are left to inference and cast later
+    """
+    dtypes = {}
+    for field in schema:
+        if pa.types.is_integer(field.type):
+            # Nullable, so a null doesn't turn the column into floats
+            dtypes[field.name] = 'Int64'
+        elif pa.types.is_floating(field.type):
+            dtypes[field.name] = 'float64'
+        elif pa.types.is_boolean(field.type):
+            dtypes[field.name] = 'boolean'
+        elif pa.types.is_string(field.type) or pa.types.is_large_string(field.type):
+            dtypes[field.name] = str
+    return dtypes
+
+def arrow_csv_options(skip_bad_lines=False, column_names=None):
+    """Build Arrow CSV read/parse options for the arrow engine"""
+    read_options = pacsv.ReadOptions(block_size=ARROW_BLOCK_SIZE, use_threads=True,
+                                     column_names=column_names)
+    if skip_bad_lines:
+        parse_options = pacsv.ParseOptions(invalid_row_handler=lambda row: 'skip')
+    else:
+        parse_options = pacsv.ParseOptions()
+    return read_options, parse_options
+
+def read_csv_table(input_path, engine='pandas'):
+    """Read a whole CSV file into a pyarrow Table with the given engine"""
+    validate_engine(engine)
+    
+    if engine == 'arrow':
+        read_options, parse_options = arrow_csv_options()
+        return pacsv.read_csv(input_path, read_options=read_options,
+                              parse_options=parse_options)
+    
+    return pa.Table.from_pandas(pd.read_csv(input_path), preserve_index=False)
+
+def read_csv_header(input_path):
+    """Return the column names from the first record of a CSV file, without a byte order mark"""
+    with open(input_path, newline='', encoding='utf-8-sig') as f:
+        return next(csv.reader(f), [])
+
+def find_record_boundaries(input_path, offsets, start=0):
+    """
+    Move byte offsets forward to the start of the next CSV record.
+    
+    A newline only ends a record when it is outside a quoted field, i.e. when
+    an even number of quote characters precede it. Quotes are counted from
+    the start of the file, so fields with embedded newlines are never cut.
+    
+    Parameters:
+    input_path (str): Path to CSV file
+    offsets (list): Byte offsets to align
+    start (int): A known record boundary to count quotes from instead of
+                 the start of the file; offsets must not precede it
+    
+    Returns:
+    list: Aligned offsets in ascending order (the file size for offsets
+          that fall inside the last record)
+    """
+    size = os.path.getsize(input_path)
+    aligned = []
+    pos = start         # Every byte before pos has been scanned
+    in_quotes = False   # Quote state at pos
+    
+    with open(input_path, 'rb') as f:
+        for offset in sorted(offsets):
+            if offset < pos:
+                aligned.append(pos)
+                continue
+            
+            # Carry the quote state up to the requested offset
+            f.seek(pos)
+            while pos < offset:
+                block = f.read(min(SCAN_BLOCK_SIZE, offset - pos))
+                if not block:
+                    break
+                in_quotes ^= block.count(b'"') % 2 == 1
+                pos += len(block)
+            
+            # Then stop after the first newline that is outside quotes
+            boundary = size
+            while boundary == size and pos < size:
+                block = f.read(SCAN_BLOCK_SIZE)
+                if not block:
+                    break
+                start = 0
+                while True:
+                    newline = block.find(b'\n', start)
+                    if newline == -1:
+                        in_quotes ^= block.count(b'"', start) % 2 == 1
+                        pos += len(block)
+                        break
+                    in_quotes ^= block.count(b'"', start, newline) % 2 == 1
+                    start = newline + 1
+                    if not in_quotes:
+                        pos += start
+                        boundary = pos
+                        break
+            aligned.append(boundary)
+    
+    return aligned
+
+def _count_records(data):
+    """Count the records (header included) in a uint8 array of CSV bytes"""
+    records = 0
+    in_quotes = False
+    last_newline = -1   # Offset of the previous record terminator
+    
+    for start in range(0, len(data), SCAN_BLOCK_SIZE):
+        block = data[start:start + SCAN_BLOCK_SIZE]
+        newlines = np.flatnonzero(block == ord('\n'))
+        quotes = np.flatnonzero(block == ord('"'))
+        
+        if len(quotes) or in_quotes:
+            # A newline is inside quotes when an odd number of quotes precede it
+            inside = (np.searchsorted(quotes, newlines) & 1).astype(bool) ^ in_quotes
+            newlines = newlines[~inside]
+            in_quotes ^= len(quotes) % 2 == 1
+        
+        newlines += start
+        if len(newlines) == 0:
+            continue
+        
+        # Records of zero length (or a lone carriage return) are blank lines
+        previous = np.empty_like(newlines)
+        previous[0] = last_newline
+        previous[1:] = newlines[:-1]
+        lengths = newlines - previous - 1
+        carriage = (lengths == 1) & (data[np.maximum(newlines - 1, 0)] == ord('\r'))
+        blank = (lengths == 0) | carriage
+        
+        records += len(newlines) - int(np.count_nonzero(blank))
+        last_newline = int(newlines[-1])
+    
+    # A final record without a trailing newline
+    if last_newline < len(data) - 1 and bytes(data[last_newline + 1:]).strip():
+        records += 1
+    return records
+
+def count_csv_records(input_path, end=None):
+    """
+    Count the data records of a CSV file from its raw bytes.
+    
+    The file is memory-mapped and scanned block by block with numpy. Only
+    newlines outside quoted fields end a record (quote state is the parity
+    of the quote characters seen so far), and blank lines are not counted,
+    matching what the parsers return for well-formed files.
+    
+    Parameters:
+    input_path (str): Path to CSV file
+    end (int): Optional byte offset, on a record boundary, to stop at
+    
+    Returns:
+    int: Number of records, not counting the header
+    """
+    size = os.path.getsize(input_path)
+    end = size if end is None else min(end, size)
+    if end == 0:
+        return 0
+    
+    with open(input_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        data = np.frombuffer(mm, dtype=np.uint8, count=end)
+        try:
+            records = _count_records(data)
+        finally:
+            # The array must be released before the mapping can be closed
+            del data
+    
+    # The first record is the header
+    return max(0, records - 1)
+
+def estimate_csv_records(input_path, sample_bytes=ROW_COUNT_SAMPLE_BYTES):
+    """
+    Estimate the number of data records by counting the records in the
+    first sample_bytes and extrapolating by file size. Exact for files
+    no larger than the sample.
+    """
+    size = os.path.getsize(input_path)
+    if size <= sample_bytes:
+        return count_csv_records(input_path)
+    
+    end = find_record_boundaries(input_path, [sample_bytes])[0]
+    with open(input_path, 'rb') as f:
+        header_bytes = len(f.readline())
+    sample_records = count_csv_records(input_path, end)
+    if sample_records == 0 or end <= header_bytes:
+        return sample_records
+    
+    bytes_per_record = (end - header_bytes) / sample_records
+    return int(round((size - header_bytes) / bytes_per_record))
+
+def split_byte_ranges(input_path, num_ranges):
+    """
+    Cut a CSV file into up to num_ranges (start, end) byte ranges of similar
+    size. Every range starts on a record boundary; the first one holds the header.
+    """
+    size = os.path.getsize(input_path)
+    offsets = [size * i // num_ranges for i in range(1, num_ranges)]
+    edges = sorted(set([0] + find_record_boundaries(input_path, offsets) + [size]))
+    return [(start, end) for start, end in zip(edges, edges[1:])]
+
+class _ByteRangeFile(io.RawIOBase):
+    """Read-only file object over bytes [start, end) of a file"""
+    
+    def __init__(self, path, start, end):
+        self._file = open(path, 'rb')
+        self._file.seek(start)
+        self._remaining = end - start
+    
+    def readable(self):
+        return True
+    
+    def readinto(self, buffer):
+        size = min(len(buffer), self._remaining)
+        if size <= 0:
+            return 0
+        read = self._file.readinto(memoryview(buffer)[:size])
+        self._remaining -= read
+        return read
+    
+    def close(self):
+        self._file.close()
+        super().close()
+
+def iter_csv_batches(input_path, batch_size, engine='pandas', skip_bad_lines=False,
+                     byte_range=None, schema=None):
+    """
+    Read a CSV file as a sequence of pyarrow Tables of at most batch_size rows.
+    
+    Parameters:
+    input_path (str): Path to input CSV file, or an open binary file object
+    batch_size (int): Maximum number of rows per yielded table
+    engine (str): 'pandas' parses with pd.read_csv; 'arrow' uses Arrow's
+                  multi-threaded CSV reader and never builds a DataFrame
+    skip_bad_lines (bool): Skip malformed rows instead of raising
+    byte_range (tuple): Optional (start, end) byte offsets, aligned to record
+                        boundaries, to read instead of the whole file. Ranges
+                        not starting at 0 take column names from the header.
+    schema (pa.Schema): Column types to parse with, e.g. from infer_csv_schema,
+                        instead of inferring them per batch (Arrow infers them
+                        from the first block only)
+    
+    Yields:
+    pyarrow.Table: Consecutive batches of the file. At least one (possibly
+                   empty) table is yielded so the schema is always known.
+    """
+    validate_engine(engine)
+    
+    source = input_path
+    column_names = None
+    if byte_range is not None:
+        source = io.BufferedReader(_ByteRangeFile(input_path, *byte_range))
+        if byte_range[0] > 0:
+            column_names = read_csv_header(input_path)
+    
+    if engine == 'pandas':
+        reader = pd.read_csv(source, chunksize=batch_size, encoding='utf-8',
+                             on_bad_lines='skip' if skip_bad_lines else 'error',
+                             header=None if column_names else 'infer',
+                             names=column_names,
+                             dtype=pandas_dtypes(schema) if schema is not None else None)
+        with reader:
+            for chunk in reader:
+                yield pa.Table.from_pandas(chunk, preserve_index=False)
+        return
+    
+    read_options, parse_options = arrow_csv_options(skip_bad_lines, column_names)
+    convert_options = None
+    if schema is not None:
+        convert_options = pacsv.ConvertOptions(
+            column_types={field.name: field.type for field in schema})
+    reader = pacsv.open_csv(source, read_options=read_options,
+                            parse_options=parse_options, convert_options=convert_options)
+    
+    # Arrow yields one record batch per block; regroup them into batch_size rows
+    pending = []
+    pending_rows = 0
+    yielded = False
+    for record_batch in reader:
+        pending.append(record_batch)
+        pending_rows += record_batch.num_rows
+        
+        while pending_rows >= batch_size:
+            table = pa.Table.from_batches(pending, schema=reader.schema)
+            yield table.slice(0, batch_size)
+            yielded = True
+            
+            rest = table.slice(batch_size)
+            pending = rest.to_batches()
+            pending_rows = rest.num_rows
+    
+    if pending_rows or not yielded:
+        yield pa.Table.from_batches(pending, schema=reader.schema)
+
+def _find_records_end(data, start, records):
+    """
+    Return the offset just past the given number of records counted from
+    start, which must be a record boundary, or len(data) if the data ends first.
+    """
+    in_quotes = False
+    pos = start
+    block_size = 1024 * 1024
+    while pos < len(data) and records > 0:
+        block = data[pos:pos + block_size]
+        newlines = np.flatnonzero(block == ord('\n'))
+        quotes = np.flatnonzero(block == ord('"'))
+        if len(quotes) or in_quotes:
+            inside = (np.searchsorted(quotes, newlines) & 1).astype(bool) ^ in_quotes
+            newlines = newlines[~inside]
+            in_quotes ^= len(quotes) % 2 == 1
+        
+        if len(newlines) >= records:
+            return pos + int(newlines[records - 1]) + 1
+        records -= len(newlines)
+        pos += len(block)
+        block_size = min(block_size * 2, SCAN_BLOCK_SIZE)
+    return len(data)
+
+def iter_csv_chunks(input_path, rows_per_chunk, engine='pandas', skip_bad_lines=False,
+                    start=None, schema=None):
+    """
+    Read a CSV file as chunks that each end at a known byte offset.
+    
+    The end of every chunk is located on the raw bytes first (quote-aware,
+    vectorized), then exactly that byte range is parsed. A chunk's end offset
+    is therefore a record boundary that reading can later resume from.
+    
+    Parameters:
+    input_path (str): Path to input CSV file
+    rows_per_chunk (int or callable): Records per chunk, or a function called
+                                      before each chunk that returns it
+    engine (str): CSV parsing engine, 'pandas' or 'arrow'
+    skip_bad_lines (bool): Skip malformed rows instead of raising
+    start (int): Record-aligned byte offset to start from; by default the
+                 first record after the header
+    schema (pa.Schema): Column types to parse with; by default each chunk is
+                        typed on its own
+    
+    Yields:
+    tuple: (pyarrow.Table, end offset). At least one (possibly empty) chunk
+           is yielded for a file without data rows.
+    """
+    validate_engine(engine)
+    size = os.path.getsize(input_path)
+    if start is None:
+        start = find_record_boundaries(input_path, [0])[0] if size else 0
+    
+    def parse(byte_range):
+        pieces = [byte_range]
+        if schema is None and engine == 'arrow':
+            # Arrow types every block like the first, so type block-sized pieces on their own
+            pieces = _record_pieces(input_path, *byte_range, SCHEMA_SCAN_BYTES)
+        tables = [table for piece in pieces
+                  for table in iter_csv_batches(input_path, DEFAULT_BATCH_SIZE, engine=engine,
+                                                skip_bad_lines=skip_bad_lines, byte_range=piece,
+                                                schema=schema)]
+        if len(tables) == 1:
+            return tables[0]
+        chunk_schema = unify_schemas([table.schema for table in tables])
+        return pa.concat_tables([conform_to_schema(table, chunk_schema) for table in tables])
+    
+    if start >= size:
+        yield parse((start, start)), start
+        return
+    
+    with open(input_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        data = np.frombuffer(mm, dtype=np.uint8)
+        try:
+            while start < size:
+                rows = rows_per_chunk() if callable(rows_per_chunk) else rows_per_chunk
+                end = _find_records_end(data, start, max(1, rows))
+                yield parse((start, end)), end
+                start = end
+        finally:
+            # The array must be released before the mapping can be closed
+            del data
+
+def _record_pieces(input_path, start, end, piece_bytes):
+    """Cut the record-aligned range [start, end) into consecutive record-aligned pieces of about piece_bytes"""
+    offsets = list(range(start + piece_bytes, end, piece_bytes))
+    edges = [start] + [min(end, edge) for edge in
+                       find_record_boundaries(input_path, offsets, start)] + [end]
+    return [(low, high) for low, high in zip(edges, edges[1:]) if low < high] or [(start, end)]
+
+def infer_csv_schema(input_path, engine='pandas', byte_range=None,
+                     samples=SCHEMA_SAMPLE_RANGES, sample_bytes=SCHEMA_SAMPLE_BYTES,
+                     exhaustive=False):
+    """
+    Infer the column types of a CSV file from samples spread across it.
+    
+    Streaming conversions fix the schema before the first row group is
+    written, so types seen only further into the file (an int column that
+    later holds a decimal) must be known up front. The head and evenly spaced
+    record-aligned samples are parsed and their types widened as in
+    unify_schemas. Columns that are empty in every sample become strings.
+    
+    Parameters:
+    input_path (str): Path to CSV file
+    engine (str): CSV parsing engine, 'pandas' or 'arrow'
+    byte_range (tuple): Optional record-aligned (start, end) to sample within
+    samples (int): Number of samples, the head included
+    sample_bytes (int): Bytes parsed per sample
+    exhaustive (bool): Parse the whole range instead, as consecutive pieces of
+                       sample_bytes that are each typed on their own, so no
+                       value is missed; reads the entire input
+    
+    Returns:
+    pa.Schema: Schema every batch of the file can be cast to
+    """
+    start, end = byte_range if byte_range is not None else (0, os.path.getsize(input_path))
+    if exhaustive:
+        pieces = _record_pieces(input_path, start, end, sample_bytes)
+    elif end - start <= samples * sample_bytes:
+        pieces = [(start, end)]
+    else:
+        starts = [start + (end - start) * i // samples for i in range(samples)]
+        offsets = sorted(set(starts[1:] + [s + sample_bytes for s in starts]))
+        aligned = dict(zip(offsets, find_record_boundaries(input_path, offsets, start)))
+        pieces = [(s if s == start else aligned[s], min(end, aligned[s + sample_bytes]))
+                  for s in starts]
+        # Samples that fell inside the last record are empty
+        pieces = [piece for piece in pieces if piece[0] < piece[1]]
+    
+    schemas = [table.schema
+               for piece in pieces
+               for table in iter_csv_batches(input_path, DEFAULT_BATCH_SIZE, engine,
+                                             skip_bad_lines=True, byte_range=piece)]
+    schema = unify_schemas(schemas)
+    
+    # A column empty in every sample may hold anything further in
+    for i, field in enumerate(schema):
+        if pa.types.is_null(field.type):
+            schema = schema.set(i, field.with_type(pa.string()))
+    return schema
+
+def read_csv_sample(input_path, engine='pandas', sample_bytes=CALIBRATION_BYTES):
+    """Parse the complete records in the first sample_bytes of a CSV file"""
+    end = find_record_boundaries(input_path, [sample_bytes])[0]
+    return pa.concat_tables(iter_csv_batches(input_path, DEFAULT_BATCH_SIZE, engine,
+                                             skip_bad_lines=True, byte_range=(0, end)),
+                            promote_options='permissive')
+
+def _codec_label(codec, level):
+    return codec if level is None else f"{codec}-{level}"
+
+def benchmark_compression(table, candidates=AUTO_COMPRESSION_CANDIDATES,
+                          repeats=BENCHMARK_REPEATS):
+    """
+    Encode a table with each candidate codec and time writing and reading it.
+    
+    Parameters:
+    table (pa.Table): Sample of the data
+    candidates (list): (codec, level) pairs; codecs missing from this build
+                       of Arrow are skipped
+    repeats (int): Timed runs per candidate; the fastest is kept
+    
+    Returns:
+    list: One dict per candidate with codec, level, bytes, ratio (size of the
+          uncompressed encoding over this one) and write_mbps / read_mbps
+          (MB of Arrow data encoded / decoded per second)
+    """
+    mb = table.nbytes / (1024 * 1024)
+    results = []
+    for codec, level in candidates:
+        if codec != 'none' and not pa.Codec.is_available(codec):
+            continue
+        write_time = read_time = float('inf')
+        for _ in range(repeats):
+            sink = pa.BufferOutputStream()
+            start = time.perf_counter()
+            pq.write_table(table, sink, compression=codec, compression_level=level)
+            write_time = min(write_time, time.perf_counter() - start)
+            
+            buffer = sink.getvalue()
+            start = time.perf_counter()
+            pq.read_table(pa.BufferReader(buffer))
+            read_time = min(read_time, time.perf_counter() - start)
+        results.append({'codec': codec, 'level': level, 'bytes': buffer.size,
+                        'write_mbps': mb / write_time if write_time > 0 else float('inf'),
+                        'read_mbps': mb / read_time if read_time > 0 else float('inf')})
+    
+    baseline = next((r['bytes'] for r in results if r['codec'] == 'none'), table.nbytes)
+    for result in results:
+        result['ratio'] = baseline / result['bytes'] if result['bytes'] else 0.0
+    return results
+
+def choose_compression(table, objective='size'):
+    """
+    Benchmark the candidate codecs on a sample and print the results.
+    
+    Returns:
+    tuple: (codec, level) that best meets the objective: the smallest
+           output for 'size', the highest write or read MB/s for 'write'/'read'
+    """
+    if objective not in COMPRESSION_OBJECTIVES:
+        raise ValueError(f"Unknown compression objective: {objective}. "
+                         f"Choose from {', '.join(COMPRESSION_OBJECTIVES)}")
+    results = benchmark_compression(table)
+    if objective == 'size':
+        best = min(results, key=lambda r: r['bytes'])
+    else:
+        best = max(results, key=lambda r: r[f'{objective}_mbps'])
+    
+    print(f"Codec benchmark on {table.num_rows:,} sample rows "
+          f"({table.nbytes / (1024 * 1024):.1f} MB), objective: {objective}")
+    for r in results:
+        marker = '*' if r is best else ' '
+        print(f" {marker} {_codec_label(r['codec'], r['level']):<10} ratio {r['ratio']:5.2f}  "
+              f"write {r['write_mbps']:8.1f} MB/s  read {r['read_mbps']:8.1f} MB/s")
+    return best['codec'], best['level']
+
+def parse_row_group_size(value):
+    """argparse type for --row-group-size: a row count or 'auto'"""
+    if value == 'auto':
+        return value
+    rows = int(value)
+    if rows <= 0:
+        raise argparse.ArgumentTypeError("row group size must be positive or 'auto'")
+    return rows
+
+class ParquetLayout:
+    """
+    Row group and page settings applied by every Parquet writer.
+    
+    With everything left at None the library defaults are used. A
+    row_group_size of 'auto' sizes row groups from the width of the data so
+    each holds about target_row_group_mb of uncompressed values, which keeps
+    row groups large enough to scan efficiently and numerous enough to split
+    a file across scan tasks.
+    """
+    
+    def __init__(self, row_group_size=None, data_page_size=None, dictionary_pagesize_limit=None,
+                 target_row_group_mb=DEFAULT_ROW_GROUP_MB, compression=None,
+                 compression_level=None, compression_objective='size'):
+        """
+        Parameters:
+        row_group_size (int or str): Rows per row group, or 'auto'
+        data_page_size (int): Target data page size in bytes
+        dictionary_pagesize_limit (int): Dictionary page size in bytes beyond
+                                         which a column falls back to plain encoding
+        target_row_group_mb (float): Uncompressed row group size in 'auto' mode
+        compression (str): One of COMPRESSIONS, or 'auto' to benchmark the
+                           codecs on a sample (see resolve_compression);
+                           None keeps the library default (snappy)
+        compression_level (int): Codec level, for zstd, lz4, gzip and brotli
+        compression_objective (str): What 'auto' optimizes: 'size', 'write' or 'read'
+        """
+        if compression is not None and compression not in COMPRESSIONS + ('auto',):
+            raise ValueError(f"Unknown compression: {compression}. "
+                             f"Choose from {', '.join(COMPRESSIONS)} or auto")
+        if compression_level is not None and compression in (None, 'snappy', 'none'):
+            raise ValueError(f"Compression {compression or 'snappy'} does not take a level")
+        if compression_objective not in COMPRESSION_OBJECTIVES:
+            raise ValueError(f"Unknown compression objective: {compression_objective}")
+        
+        self.row_group_size = row_group_size
+        self.data_page_size = data_page_size
+        self.dictionary_pagesize_limit = dictionary_pagesize_limit
+        self.target_row_group_bytes = int(target_row_group_mb * 1024 * 1024)
+        self.compression = compression
+        self.compression_level = compression_level
+        self.compression_objective = compression_objective
+    
+    @classmethod
+    def from_options(cls, options):
+        """Build a layout from a dict that may hold the constructor keywords"""
+        return cls(**{name: options[name] for name in LAYOUT_OPTIONS if name in options})
+    
+    def options(self):
+        """The settings that differ from the defaults, for option fingerprints"""
+        values = {'row_group_size': self.row_group_size,
+                  'data_page_size': self.data_page_size,
+                  'dictionary_pagesize_limit': self.dictionary_pagesize_limit,
+                  'compression': self.compression,
+                  'compression_level': self.compression_level}
+        if self.row_group_size == 'auto':
+            values['target_row_group_mb'] = self.target_row_group_bytes / (1024 * 1024)
+        if self.compression == 'auto':
+            values['compression_objective'] = self.compression_objective
+        return {name: value for name, value in values.items() if value is not None}
+    
+    def resolve_compression(self, sample):
+        """
+        Replace compression='auto' with the codec and level that best meet the
+        objective on a sample table. Done once, before any file is written, so
+        every file of a conversion uses the same codec.
+        """
+        if self.compression == 'auto':
+            self.compression, self.compression_level = choose_compression(
+                sample, self.compression_objective)
+    
+    def writer_options(self):
+        """Keyword arguments for pq.ParquetWriter and pq.write_table"""
+        if self.compression == 'auto':
+            raise ValueError("compression='auto' must be resolved before writing")
+        return {name: value for name, value in (('data_page_size', self.data_page_size),
+                                                ('dictionary_pagesize_limit',
+                                                 self.dictionary_pagesize_limit),
+                                                ('compression', self.compression),
+                                                ('compression_level', self.compression_level))
+                if value is not None}
+    
+    def rows_per_group(self, table):
+        """Row group size to use for table, or None for the library default"""
+        if self.row_group_size != 'auto':
+            return self.row_group_size
+        if not table.num_rows:
+            return None
+        return max(1, int(self.target_row_group_bytes * table.num_rows / max(1, table.nbytes)))
+    
+    def open_writer(self, where, schema):
+        return pq.ParquetWriter(where, schema, **self.writer_options())
+    
+    def write_table(self, table, where):
+        """Write table as a complete Parquet file"""
+        pq.write_table(table, where, row_group_size=self.rows_per_group(table),
+                       **self.writer_options())
+    
+    def row_groups(self, tables):
+        """
+        Regroup a stream of tables into row-group-sized tables for a
+        ParquetWriter. Without a row group size every table is passed through
+        and becomes a row group of its own, as before.
+        """
+        if self.row_group_size is None:
+            yield from tables
+            return
+        
+        rows = None
+        pending = []
+        pending_rows = 0
+        yielded = False
+        for table in tables:
+            if rows is None:
+                # Fix the size from the first table so row groups come out even
+                rows = self.rows_per_group(table)
+            pending.append(table)
+            pending_rows += table.num_rows
+            if rows and pending_rows >= rows:
+                table = _concat_with_first_schema(pending)
+                while table.num_rows >= rows:
+                    yield table.slice(0, rows)
+                    yielded = True
+                    table = table.slice(rows)
+                pending = [table]
+                pending_rows = table.num_rows
+        
+        # An empty input still yields one table, so the schema gets written
+        if pending_rows or (pending and not yielded):
+            yield _concat_with_first_schema(pending)
+
+# Keyword arguments of convert_csv_to_parquet that describe the Parquet layout
+LAYOUT_OPTIONS = ('row_group_size', 'data_page_size', 'dictionary_pagesize_limit',
+                  'target_row_group_mb', 'compression', 'compression_level',
+                  'compression_objective')
+
+def _sort_table(table, sort_keys):
+    # Stable, so rows with equal keys keep their order; nulls sort last
+    return table.take(pc.sort_indices(table, sort_keys=sort_keys))
+
+def _concat_with_first_schema(tables):
+    """Concatenate tables in the first one's schema, widening types if casting fails"""
+    try:
+        return pa.concat_tables([conform_to_schema(t, tables[0].schema) for t in tables])
+    except ValueError:
+        return pa.concat_tables(tables, promote_options='permissive')
+
+def _spill_sorted_runs(tables, sort_keys, run_dir, memory_bytes, batch_size):
+    """
+    Sort tables in memory-sized runs. A single run is returned as a table;
+    otherwise each run is written to run_dir and the list of paths returned.
+    """
+    runs = []
+    pending = []
+    pending_bytes = 0
+    
+    def spill():
+        run = _sort_table(_concat_with_first_schema(pending), sort_keys)
+        path = os.path.join(run_dir, f"run-{len(runs):05d}.parquet")
+        pq.write_table(run, path, row_group_size=batch_size)
+        runs.append(path)
+    
+    for table in tables:
+        pending.append(table)
+        pending_bytes += table.nbytes
+        if pending_bytes >= memory_bytes:
+            spill()
+            pending = []
+            pending_bytes = 0
+    
+    if not runs:
+        return _sort_table(_concat_with_first_schema(pending), sort_keys)
+    if pending:
+        spill()
+    return runs
+
+def _row_key(table, key_names, row):
+    """Comparable sort key of one row, ordered as sort_indices orders it: NaN after every number, nulls last"""
+    key = []
+    for name in key_names:
+        value = table.column(name)[row].as_py()
+        if value is None:
+            key.append((2, 0))
+        elif isinstance(value, float) and math.isnan(value):
+            key.append((1, 0))
+        else:
+            key.append((0, value))
+    return tuple(key)
+
+def _merge_sorted_runs(run_paths, sort_keys, read_rows):
+    """
+    K-way merge of sorted run files, a batch per run at a time.
+    
+    The smallest last key among the runs' current batches is a safe cutoff:
+    every row not yet read is at least that large, so all buffered rows up to
+    it can be emitted. Rows equal to it wait in the runs after its owner,
+    which may still read more of them, so equal keys keep their run order.
+    Each batch is already sorted, so the rows to emit are a prefix found by
+    binary search; only those rows are sorted together. The run owning the
+    cutoff is then read further.
+    """
+    key_names = [column for column, _ in sort_keys]
+    schemas = [pq.read_schema(path) for path in run_paths]
+    schema = unify_schemas(schemas)
+    for column in key_names:
+        # Falling back to strings would change the order the runs were sorted in
+        if any(s.field(column).type != schema.field(column).type and
+               pa.types.is_string(schema.field(column).type) for s in schemas):
+            raise ValueError(f"Sort column {column} has incompatible types across the input")
+    
+    readers = [pq.ParquetFile(path).iter_batches(read_rows) for path in run_paths]
+    buffers = [None] * len(readers)
+    
+    def refill(i):
+        buffers[i] = None
+        for batch in readers[i]:
+            if batch.num_rows:
+                buffers[i] = conform_to_schema(pa.Table.from_batches([batch]), schema)
+                return
+    
+    def rows_before(buffer, cutoff, inclusive):
+        low, high = 0, buffer.num_rows
+        while low < high:
+            middle = (low + high) // 2
+            key = _row_key(buffer, key_names, middle)
+            if key < cutoff or (inclusive and key == cutoff):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+    
+    for i in range(len(readers)):
+        refill(i)
+    
+    while True:
+        live = [i for i, buffer in enumerate(buffers) if buffer is not None]
+        if not live:
+            return
+        
+        # The first run whose current batch ends with the smallest key sets the cutoff
+        last_keys = [_row_key(buffers[i], key_names, buffers[i].num_rows - 1) for i in live]
+        cutoff = min(last_keys)
+        owner = live[last_keys.index(cutoff)]
+        
+        pieces = []
+        for i in live:
+            count = rows_before(buffers[i], cutoff, i <= owner)
+            pieces.append(buffers[i].slice(0, count))
+            if count == buffers[i].num_rows:
+                refill(i)
+            else:
+                buffers[i] = buffers[i].slice(count)
+        
+        # Stable, so equal keys keep the order of their runs
+        yield _sort_table(pa.concat_tables(pieces), sort_keys)
+
+def iter_sorted_batches(tables, sort_by, batch_size=DEFAULT_BATCH_SIZE, memory_bytes=None,
+                        temp_dir=None):
+    """
+    Sort a stream of tables on the given columns with an external merge sort.
+    
+    Input is collected until memory_bytes is reached, sorted and spilled to a
+    temporary directory as a run; the runs are then merged back. Input that
+    fits in memory is sorted without touching disk.
+    
+    Parameters:
+    tables (iterable): Tables to sort, e.g. from iter_csv_batches
+    sort_by (list): Column names, most significant first; nulls sort last
+    batch_size (int): Rows per yielded table
+    memory_bytes (int): In-memory run size; defaults to DEFAULT_SORT_MEMORY_MB
+    temp_dir (str): Where sorted runs are spilled; defaults to the system temp directory
+    
+    Returns:
+    generator: Sorted tables of batch_size rows (the last may be shorter)
+    """
+    if memory_bytes is None:
+        memory_bytes = DEFAULT_SORT_MEMORY_MB * 1024 * 1024
+    sort_keys = [(column, 'ascending') for column in sort_by]
+    read_rows = max(1, min(batch_size, DEFAULT_BATCH_SIZE))
+    
+    with tempfile.TemporaryDirectory(prefix='csv_to_parquet_sort_', dir=temp_dir) as run_dir:
+        runs = _spill_sorted_runs(tables, sort_keys, run_dir, memory_bytes, read_rows)
+        if isinstance(runs, pa.Table):
+            merged = [runs]
+        else:
+            merged = _merge_sorted_runs(runs, sort_keys, read_rows)
+        
+        # Regroup the merge output, which comes in uneven pieces
+        pending = []
+        pending_rows = 0
+        for table in merged:
+            pending.append(table)
+            pending_rows += table.num_rows
+            if pending_rows >= batch_size:
+                table = pa.concat_tables(pending)
+                while table.num_rows >= batch_size:
+                    yield table.slice(0, batch_size)
+                    table = table.slice(batch_size)
+                pending = [table]
+                pending_rows = table.num_rows
+        
+        if pending_rows:
+            yield pa.concat_tables(pending)
+
+def _convert_with_widening(input_path, engine, byte_range, convert):
+    """
+    Run convert(schema) with the schema inferred from samples of the file.
+    
+    A value the samples missed (an int column holding a decimal further in)
+    makes a batch fail to parse or cast. The whole input is then scanned for
+    its full schema and the conversion run again, so the output gets the
+    types a whole-file read would give. convert must remove its partial
+    output when it fails.
+    """
+    schema = infer_csv_schema(input_path, engine, byte_range)
+    try:
+        return convert(schema)
+    except (ValueError, TypeError):
+        full_schema = infer_csv_schema(input_path, engine, byte_range,
+                                       sample_bytes=SCHEMA_SCAN_BYTES, exhaustive=True)
+        if full_schema.equals(schema, check_metadata=False):
+            raise
+        print(f"Column types of {input_path} widen past the sampled rows, "
+              f"converting again with the types of the whole file")
+        return convert(full_schema)
+
+def _stream_csv_to_parquet(input_path, output_path, batch_size, engine='pandas',
+                           byte_range=None, sort_by=None, sort_memory_bytes=None,
+                           temp_dir=None, layout=None):
+    """
+    Convert a CSV file batch by batch, appending each batch to the output
+    as a row group (or regrouped to the layout's row group size). Peak memory
+    is bounded by batch_size rows, or by the sort memory when the rows are
+    sorted on sort_by first. Every batch is cast to a schema inferred from
+    samples across the file, widened from a full scan if a later value
+    does not fit it.
+    """
+    layout = layout or ParquetLayout()
+    
+    def convert(schema):
+        tables = (conform_to_schema(table, schema)
+                  for table in iter_csv_batches(input_path, batch_size, engine=engine,
+                                                byte_range=byte_range, schema=schema))
+        if sort_by:
+            tables = iter_sorted_batches(tables, sort_by, batch_size, sort_memory_bytes, temp_dir)
+        
+        writer = None
+        try:
+            for table in layout.row_groups(tables):
+                if writer is None:
+                    writer = layout.open_writer(output_path, table.schema)
+                else:
+                    table = conform_to_schema(table, writer.schema)
+                
+                writer.write_table(table)
+        except Exception:
+            # Don't leave a truncated file behind
+            if writer is not None:
+                writer.close()
+                writer = None
+                os.remove(output_path)
+            raise
+        finally:
+            if writer is not None:
+                writer.close()
+    
+    _convert_with_widening(input_path, engine, byte_range, convert)
+
+def write_dataset_metadata(root, files):
+    """
+    Write _common_metadata (schema only) and _metadata (schema plus the row
+    group metadata of every file) summary files into root, so readers can
+    plan a query over the whole directory from a single file.
+    
+    Parameters:
+    root (str): Dataset directory; file paths are recorded relative to it
+    files (list): Parquet files to summarize, in dataset order
+    
+    Returns:
+    list: Files left out because their schema differs from the first file's
+    """
+    root = Path(root)
+    schema = None
+    collected = []
+    skipped = []
+    
+    for parquet_file in files:
+        metadata = pq.read_metadata(parquet_file)
+        file_schema = metadata.schema.to_arrow_schema()
+        if schema is None:
+            schema = file_schema
+        elif not file_schema.equals(schema, check_metadata=False):
+            skipped.append(parquet_file)
+            continue
+        metadata.set_file_path(Path(os.path.relpath(parquet_file, root)).as_posix())
+        collected.append(metadata)
+    
+    if schema is None:
+        return skipped
+    
+    pq.write_metadata(schema, root / '_common_metadata')
+    pq.write_metadata(schema, root / '_metadata', metadata_collector=collected)
+    
+    if skipped:
+        print(f"Warning: {len(skipped)} files with a different schema were left out of "
+              f"{root / '_metadata'}: {', '.join(str(f) for f in skipped[:5])}"
+              f"{' ...' if len(skipped) > 5 else ''}")
+    return skipped
+
+def _partition_dir_name(column, value):
+    """Hive directory name for one partition key, e.g. region=EU"""
+    if value is None or (isinstance(value, float) and math.isnan(value)) or value is pd.NaT:
+        text = HIVE_NULL_PARTITION
+    elif isinstance(value, float) and value.is_integer():
+        # Batches of an int column that hold a null may be parsed as floats;
+        # 1 and 1.0 must name the same partition
+        text = str(int(value))
+    else:
+        text = quote(str(value), safe=' ')
+    return f"{quote(column, safe=' ')}={text}"
+
+class PartitionedWriter:
+    """
+    Streams tables into a Hive-style layout, root/col1=a/col2=b/part-N.parquet.
+    
+    Rows are grouped by the partition columns, which are dropped from the
+    files themselves (readers restore them from the directory names). Each
+    partition buffers rows in memory until max_partition_bytes is reached and
+    then flushes them to its open file as one row group; when all buffers
+    together pass max_buffer_bytes the largest ones are flushed, so memory
+    stays bounded however many partitions there are. At most
+    max_open_writers files are open at a time; the least recently used one is
+    closed to make room, and that partition continues in a new part file.
+    """
+    
+    def __init__(self, root, partition_by, max_open_writers=DEFAULT_MAX_OPEN_WRITERS,
+                 max_partition_bytes=None, max_rows_per_file=None,
+                 file_template='{partition}/part-{number:05d}.parquet', layout=None,
+                 max_buffer_bytes=None):
+        """
+        Parameters:
+        root (str): Output directory
+        partition_by (list): Columns to partition on, outermost first
+        max_open_writers (int): Open partition files allowed at once
+        max_partition_bytes (int): Per-partition buffer limit; defaults to
+                                   DEFAULT_PARTITION_BUFFER_MB
+        max_rows_per_file (int): Start a new part file once a file holds this
+                                 many rows; unlimited by default
+        file_template (str): Path of a part file relative to root, formatted
+                             with the partition name and the part number
+        layout (ParquetLayout): Row group and page settings of the files
+        max_buffer_bytes (int): Limit on the rows buffered across all
+                                partitions; defaults to DEFAULT_TOTAL_BUFFER_MB
+        """
+        self.root = Path(root)
+        self.partition_by = list(partition_by)
+        self.max_open_writers = max(1, max_open_writers)
+        self.max_partition_bytes = (max_partition_bytes if max_partition_bytes is not None
+                                    else DEFAULT_PARTITION_BUFFER_MB * 1024 * 1024)
+        self.max_buffer_bytes = (max_buffer_bytes if max_buffer_bytes is not None
+                                 else DEFAULT_TOTAL_BUFFER_MB * 1024 * 1024)
+        self.buffered_bytes = 0
+        self.max_rows_per_file = max_rows_per_file
+        self.file_template = file_template
+        self.layout = layout or ParquetLayout()
+        self.writers = OrderedDict()  # partition dir -> (writer, path, rows written)
+        self.buffers = {}             # partition dir -> (tables, bytes)
+        self.part_numbers = {}
+        self.schemas = {}
+        self.files = []
+        self.partition_files = {}
+    
+    def write(self, table):
+        """Route the rows of table to their partitions"""
+        missing = [c for c in self.partition_by if c not in table.column_names]
+        if missing:
+            raise ValueError(f"Partition columns not found: {', '.join(missing)}")
+        
+        # Group on the Arrow values; a DataFrame would turn int keys with nulls into floats
+        rows = pa.array(np.arange(table.num_rows))
+        groups = (table.select(self.partition_by).append_column('__row', rows)
+                  .group_by(self.partition_by, use_threads=False)
+                  .aggregate([('__row', 'list')]))
+        positions = groups.column('__row_list')
+        for i in range(groups.num_rows):
+            partition = os.path.join(*(_partition_dir_name(c, groups.column(c)[i].as_py())
+                                       for c in self.partition_by))
+            self.write_partition(partition, table.take(positions[i].values)
+                                 .drop_columns(self.partition_by))
+    
+    def write_partition(self, partition, rows):
+        """Buffer rows that are already known to belong to partition"""
+        tables, size = self.buffers.get(partition, ([], 0))
+        tables.append(rows)
+        size += rows.nbytes
+        self.buffers[partition] = (tables, size)
+        self.buffered_bytes += rows.nbytes
+        if size >= self.max_partition_bytes:
+            self._flush(partition)
+        while self.buffered_bytes > self.max_buffer_bytes:
+            self._flush(max(self.buffers, key=lambda name: self.buffers[name][1]))
+    
+    def _open(self, partition, schema):
+        while len(self.writers) >= self.max_open_writers:
+            self._close_writer(next(iter(self.writers)))
+        
+        number = self.part_numbers.get(partition, 0)
+        self.part_numbers[partition] = number + 1
+        path = self.root / self.file_template.format(partition=partition, number=number)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.writers[partition] = (self.layout.open_writer(path, schema), path, 0)
+        self.files.append(str(path))
+        self.partition_files.setdefault(partition, []).append(str(path))
+    
+    def _close_writer(self, partition):
+        writer, _, _ = self.writers.pop(partition)
+        writer.close()
+    
+    def _flush(self, partition):
+        tables, size = self.buffers.pop(partition, ([], 0))
+        self.buffered_bytes -= size
+        if not tables:
+            return
+        
+        # Later batches may infer different types; keep the partition's first schema if possible
+        schema = self.schemas.setdefault(partition, tables[0].schema)
+        try:
+            table = pa.concat_tables([conform_to_schema(t, schema) for t in tables])
+        except ValueError:
+            table = pa.concat_tables(tables, promote_options='permissive')
+            self.schemas[partition] = table.schema
+        
+        while table.num_rows:
+            if partition in self.writers:
+                writer, path, written = self.writers[partition]
+                if not writer.schema.equals(table.schema, check_metadata=False) or (
+                        self.max_rows_per_file and written >= self.max_rows_per_file):
+                    self._close_writer(partition)
+            if partition not in self.writers:
+                self._open(partition, table.schema)
+            
+            self.writers.move_to_end(partition)
+            writer, path, written = self.writers[partition]
+            take = table.num_rows
+            if self.max_rows_per_file:
+                take = min(take, self.max_rows_per_file - written)
+            piece = table.slice(0, take)
+            writer.write_table(piece, row_group_size=self.layout.rows_per_group(piece))
+            self.writers[partition] = (writer, path, written + take)
+            table = table.slice(take)
+    
+    def close(self):
+        """
+        Flush all buffered rows and close every open file.
+        
+        Returns:
+        list: Paths of the files written, in creation order
+        """
+        try:
+            for partition in list(self.buffers):
+                self._flush(partition)
+        finally:
+            for partition in list(self.writers):
+                self._close_writer(partition)
+        return self.files
+
+def _partition_csv_to_parquet(input_path, output_dir, partition_by, batch_size,
+                              engine='pandas', sort_by=None, sort_memory_bytes=None,
+                              temp_dir=None, layout=None):
+    """Stream a CSV file into a Hive-partitioned directory"""
+    def convert(schema):
+        tables = (conform_to_schema(table, schema)
+                  for table in iter_csv_batches(input_path, batch_size, engine=engine,
+                                                schema=schema))
+        if sort_by:
+            tables = iter_sorted_batches(tables, sort_by, batch_size, sort_memory_bytes, temp_dir)
+        
+        writer = PartitionedWriter(output_dir, partition_by, layout=layout)
+        try:
+            for table in tables:
+                writer.write(table)
+        except Exception:
+            # Don't leave partial partitions behind
+            try:
+                writer.close()
+            finally:
+                for path in writer.files:
+                    if os.path.exists(path):
+                        os.remove(path)
+            raise
+        return writer.close()
+    
+    return _convert_with_widening(input_path, engine, None, convert)
+
+def file_digest(path):
+    """Hash the contents of a file, reading it in blocks (xxh3 if available)"""
+    digest = xxhash.xxh3_128() if xxhash is not None else hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(SCAN_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def options_fingerprint(options):
+    """Short stable hash of the conversion options that shape the output"""
+    encoded = json.dumps(options, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+class ConversionCache:
+    """
+    Content-addressed store of converted Parquet files.
+    
+    Entries are keyed by a hash of the source bytes plus the conversion
+    options, so the same extract is only parsed once no matter what it is
+    called. A hit hardlinks (or copies) the cached file to the output. Entry
+    mtimes track last use and the least recently used entries are evicted
+    once the cache grows past max_bytes.
+    """
+    
+    def __init__(self, cache_dir, max_bytes=None):
+        """
+        Parameters:
+        cache_dir (str): Directory holding the cache
+        max_bytes (int): Size limit; defaults to DEFAULT_CACHE_SIZE_MB
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes if max_bytes is not None else DEFAULT_CACHE_SIZE_MB * 1024 * 1024
+        self.objects_dir = self.cache_dir / 'objects'
+        self.log_path = self.cache_dir / 'events.log'
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+    
+    def key(self, input_path, options):
+        """Cache key for converting input_path with the given options"""
+        return f"{file_digest(input_path)}-{options_fingerprint(options)}"
+    
+    def _entry_path(self, key):
+        return self.objects_dir / key[:2] / f"{key}.parquet"
+    
+    def _log(self, event, size=0):
+        # One short append per event, so concurrent workers don't clobber each other
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write(f"{event} {size}\n")
+    
+    def fetch(self, key, output_path):
+        """Place the cached output for key at output_path; return True on a hit"""
+        entry = self._entry_path(key)
+        if not entry.exists():
+            self._log('miss')
+            return False
+        
+        _link_or_copy(entry, output_path)
+        os.utime(entry)
+        self._log('hit', entry.stat().st_size)
+        return True
+    
+    def store(self, key, output_path):
+        """Add a freshly converted output to the cache and evict if over the limit"""
+        entry = self._entry_path(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        
+        tmp_path = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+        _link_or_copy(output_path, tmp_path)
+        os.replace(tmp_path, entry)
+        self.evict()
+    
+    def entries(self):
+        """List (path, size, last_used) for every cached output, oldest first"""
+        found = []
+        for entry in self.objects_dir.glob('*/*.parquet'):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            found.append((entry, stat.st_size, stat.st_mtime))
+        return sorted(found, key=lambda item: item[2])
+    
+    def evict(self):
+        """Remove least recently used entries until the cache fits max_bytes"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for entry, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(entry)
+            except FileNotFoundError:
+                continue
+            total -= size
+            self._log('evict', size)
+    
+    def clear(self):
+        """Remove every entry and reset the statistics"""
+        for entry, _, _ in self.entries():
+            os.remove(entry)
+        if self.log_path.exists():
+            os.remove(self.log_path)
+    
+    def stats(self):
+        """Summarize cache contents and hit/miss/eviction counts"""
+        entries = self.entries()
+        counts = {'hit': 0, 'miss': 0, 'evict': 0}
+        hit_bytes = 0
+        if self.log_path.exists():
+            with open(self.log_path, encoding='utf-8') as f:
+                for line in f:
+                    event, _, size = line.partition(' ')
+                    if event in counts:
+                        counts[event] += 1
+                    if event == 'hit':
+                        hit_bytes += int(size or 0)
+        
+        lookups = counts['hit'] + counts['miss']
+        return {
+            'entries': len(entries),
+            'total_bytes': sum(size for _, size, _ in entries),
+            'max_bytes': self.max_bytes,
+            'hits': counts['hit'],
+            'misses': counts['miss'],
+            'hit_rate': counts['hit'] / lookups if lookups else 0.0,
+            'bytes_served': hit_bytes,
+            'evictions': counts['evict'],
+            'oldest_use': entries[0][2] if entries else None,
+            'newest_use': entries[-1][2] if entries else None,
+        }
+
+def _link_or_copy(source, destination):
+    """Hardlink source to destination, copying when linking is not possible"""
+    if os.path.lexists(destination):
+        os.remove(destination)
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+def _remove_shared_output(output_path):
+    """
+    Unlink an existing output that shares its inode with a cache entry, so
+    writing the new output cannot truncate the cached copy.
+    """
+    try:
+        if os.stat(output_path).st_nlink > 1:
+            os.remove(output_path)
+    except FileNotFoundError:
+        pass
+
+def _convert_csv_range(input_path, byte_range, part_path, batch_size=DEFAULT_BATCH_SIZE,
+                       engine='pandas'):
+    """
+    Parse one byte range of a CSV file into an uncompressed Arrow IPC part
+    file. Parts are cheap to write and read back; the merge encodes them to
+    Parquet once, with the final layout.
+    """
+    def convert(schema):
+        try:
+            with pa.OSFile(part_path, 'wb') as sink, pa.ipc.new_file(sink, schema) as writer:
+                for table in iter_csv_batches(input_path, batch_size, engine=engine,
+                                              byte_range=byte_range, schema=schema):
+                    writer.write_table(conform_to_schema(table, schema))
+        except Exception:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            raise
+    
+    try:
+        _convert_with_widening(input_path, engine, byte_range, convert)
+        return part_path
+    except Exception as e:
+        raise Exception(f"Error converting {input_path} bytes {byte_range[0]}-{byte_range[1]}: {str(e)}")
+
+def _merge_ipc_parts(part_paths, output_path, layout=None):
+    """
+    Encode Arrow IPC part files, in order, into a single Parquet file and
+    remove the parts. Parts are cast to a common schema since each one had
+    its column types inferred separately.
+    """
+    layout = layout or ParquetLayout()
+    
+    def read_schema(part):
+        with pa.OSFile(part) as source:
+            return pa.ipc.open_file(source).schema
+    
+    def batches(schema):
+        for part in part_paths:
+            with pa.OSFile(part) as source:
+                reader = pa.ipc.open_file(source)
+                for i in range(reader.num_record_batches):
+                    yield conform_to_schema(pa.Table.from_batches([reader.get_batch(i)]), schema)
+    
+    try:
+        _remove_shared_output(output_path)
+        schema = unify_schemas([read_schema(part) for part in part_paths])
+        with layout.open_writer(output_path, schema) as writer:
+            for table in layout.row_groups(batches(schema)):
+                writer.write_table(table)
+        return output_path
+    except Exception as e:
+        raise Exception(f"Error merging parts into {output_path}: {str(e)}")
+    finally:
+        for part in part_paths:
+            if os.path.exists(part):
+                os.remove(part)
+
+def _parallel_csv_to_parquet(input_path, output_path, workers, batch_size, engine='pandas',
+                             layout=None):
+    """
+    Convert a single CSV file with several processes: the file is cut into
+    quote-aware byte ranges, each range is parsed into an Arrow IPC part file
+    by its own worker and the parts are encoded to Parquet in file order.
+    """
+    ranges = split_byte_ranges(input_path, workers)
+    part_paths = [f"{output_path}.part-{start:015d}" for start, _ in ranges]
+    
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_convert_csv_range, input_path, byte_range, part_path,
+                                       batch_size, engine)
+                       for byte_range, part_path in zip(ranges, part_paths)]
+            for future in futures:
+                future.result()
+    except Exception:
+        for part in part_paths:
+            if os.path.exists(part):
+                os.remove(part)
+        raise
+    
+    _merge_ipc_parts(part_paths, output_path, layout)
+
+def convert_csv_to_parquet(input_path, output_path=None, streaming=False,
+                           batch_size=DEFAULT_BATCH_SIZE, engine='pandas',
+                           cache_dir=None, cache_max_bytes=None, parallel_workers=1,
+                           partition_by=None, sort_by=None, sort_memory_mb=DEFAULT_SORT_MEMORY_MB,
+                           temp_dir=None, row_group_size=None, data_page_size=None,
+                           dictionary_pagesize_limit=None, target_row_group_mb=DEFAULT_ROW_GROUP_MB,
+                           compression=None, compression_level=None, compression_objective='size'):
     """
     Convert a CSV file to Parquet format.
     
@@ -11,84 +1499,585 @@ def convert_csv_to_parquet(input_path, output_path=None):
     input_path (str): Path to input CSV file
     output_path (str): Optional path for output Parquet file. If not provided,
                       will use the same name as input file with .parquet extension
+    streaming (bool): Read the CSV in batches and append them to a single
+                      Parquet file as row groups instead of loading it all
+                      into memory
+    batch_size (int): Number of rows per batch in streaming mode
+    engine (str): CSV parsing engine, 'pandas' or 'arrow'. The arrow engine
+                  parses with Arrow's multi-threaded reader and writes Arrow
+                  tables straight to Parquet without a DataFrame copy
+    cache_dir (str): Optional conversion cache directory. Sources whose
+                     contents and options were converted before are served
+                     from the cache instead of being parsed again
+    cache_max_bytes (int): Cache size limit; least recently used entries
+                           are evicted beyond it
+    parallel_workers (int): Parse the file as this many record-aligned byte
+                            ranges in separate processes and reassemble them
+                            in order. Each range is streamed in batches
+    partition_by (list): Write a Hive-partitioned directory (output_path
+                         becomes a directory holding col=value/part-N.parquet
+                         files) instead of a single file. The input is always
+                         streamed in batch_size batches; the cache and
+                         parallel_workers are not used in this mode
+    sort_by (list): Cluster the output on these columns so row group min/max
+                    statistics are selective. Uses an external merge sort that
+                    streams the input and spills sorted runs to temp_dir;
+                    parallel_workers is ignored
+    sort_memory_mb (float): Memory for each in-memory sorted run
+    temp_dir (str): Directory for spilled runs (system temp directory by default)
+    row_group_size (int or str): Rows per row group, or 'auto' to size row
+                                 groups to target_row_group_mb of
+                                 uncompressed data. In streaming mode batches
+                                 are regrouped to this size; by default each
+                                 batch is one row group
+    data_page_size (int): Target data page size in bytes
+    dictionary_pagesize_limit (int): Dictionary page size in bytes beyond
+                                     which a column stops dictionary encoding
+    target_row_group_mb (float): Uncompressed row group size in 'auto' mode
+    compression (str): Codec, one of COMPRESSIONS, or 'auto' to trial-encode
+                       the head of the file with each candidate codec and use
+                       the best for compression_objective. Defaults to snappy
+    compression_level (int): Codec level (zstd, lz4, gzip, brotli)
+    compression_objective (str): 'size', 'write' or 'read' for compression='auto'
     
     Returns:
-    str: Path to the created Parquet file
+    str: Path to the created Parquet file or partitioned directory
     """
     try:
-        # Read CSV file
-        df = pd.read_csv(input_path)
+        validate_engine(engine)
         
         # If output path is not provided, create one
         if output_path is None:
             output_path = str(Path(input_path).with_suffix('.parquet'))
+        
+        layout = ParquetLayout(row_group_size, data_page_size, dictionary_pagesize_limit,
+                               target_row_group_mb, compression, compression_level,
+                               compression_objective)
+        # Keyed on the unresolved options, so a cache hit skips the codec benchmark
+        layout_key = layout.options()
+        
+        sort_options = {}
+        if sort_by:
+            sort_options = {'sort_by': sort_by,
+                            'sort_memory_bytes': int(sort_memory_mb * 1024 * 1024),
+                            'temp_dir': temp_dir}
+        
+        if partition_by:
+            if layout.compression == 'auto':
+                layout.resolve_compression(read_csv_sample(input_path, engine))
+            files = _partition_csv_to_parquet(input_path, output_path, partition_by,
+                                              batch_size, engine, layout=layout,
+                                              **sort_options)
+            print(f"Wrote {len(files)} files under {output_path}")
+            return output_path
             
         # Create directory if it doesn't exist
         os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
         
-        # Write to Parquet format
-        df.to_parquet(output_path, index=False)
+        cache = None
+        if cache_dir:
+            cache = ConversionCache(cache_dir, cache_max_bytes)
+            options = {'streaming': streaming, 'batch_size': batch_size, 'engine': engine}
+            if sort_by:
+                options['sort_by'] = list(sort_by)
+            elif parallel_workers and parallel_workers > 1:
+                # Parts are typed separately, so the output differs from a serial run
+                options['parallel_workers'] = parallel_workers
+            options.update(layout_key)
+            cache_key = cache.key(input_path, options)
+            if cache.fetch(cache_key, output_path):
+                return output_path
+        
+        if layout.compression == 'auto':
+            layout.resolve_compression(read_csv_sample(input_path, engine))
+        _remove_shared_output(output_path)
+        
+        if sort_by:
+            _stream_csv_to_parquet(input_path, output_path, batch_size, engine, layout=layout,
+                                   **sort_options)
+        elif parallel_workers and parallel_workers > 1:
+            _parallel_csv_to_parquet(input_path, output_path, parallel_workers,
+                                     batch_size, engine, layout)
+        elif streaming:
+            _stream_csv_to_parquet(input_path, output_path, batch_size, engine, layout=layout)
+        elif engine == 'arrow':
+            layout.write_table(read_csv_table(input_path, engine), output_path)
+        else:
+            # Read CSV file and write to Parquet format
+            df = pd.read_csv(input_path)
+            layout.write_table(pa.Table.from_pandas(df, preserve_index=False), output_path)
+        
+        if cache is not None:
+            cache.store(cache_key, output_path)
         
         return output_path
     
     except Exception as e:
         raise Exception(f"Error converting {input_path}: {str(e)}")
 
-def batch_convert_csv_to_parquet(input_dir, output_dir=None):
+def predict_makespan(task_sizes, workers):
+    """
+    Simulate largest-first (LPT) scheduling of tasks on identical workers.
+    
+    Returns:
+    int: Load of the busiest worker, in the same unit as task_sizes
+    """
+    loads = [0] * max(1, workers)
+    for size in sorted(task_sizes, reverse=True):
+        heapq.heappush(loads, heapq.heappop(loads) + size)
+    return max(loads)
+
+def _measure_throughput(input_path, engine='pandas'):
+    """Estimate conversion speed in bytes/second from the head of a file"""
+    try:
+        end = find_record_boundaries(input_path, [CALIBRATION_BYTES])[0]
+        if end <= 0:
+            return None
+        
+        start_time = time.perf_counter()
+        sink = io.BytesIO()
+        table = pa.concat_tables(iter_csv_batches(input_path, DEFAULT_BATCH_SIZE, engine,
+                                                  byte_range=(0, end)))
+        pq.write_table(table, sink)
+        elapsed = time.perf_counter() - start_time
+        return end / elapsed if elapsed > 0 else None
+    except Exception:
+        return None
+
+def _plan_batch(jobs, workers):
+    """
+    Turn batch jobs into parallel tasks, largest first.
+    
+    Files larger than half of the ideal per-worker share (total bytes /
+    workers) are cut into byte ranges so that a single huge file cannot
+    dominate the makespan.
+    
+    Returns:
+    list: (size, job_index, byte_range) tuples sorted by descending size;
+          byte_range is None for whole-file tasks
+    """
+    sizes = [os.path.getsize(csv_file) for csv_file, _ in jobs]
+    range_size = max(MIN_RANGE_BYTES, sum(sizes) // (workers * 2))
+    
+    tasks = []
+    for i, size in enumerate(sizes):
+        if size > range_size:
+            for start, end in split_byte_ranges(jobs[i][0], math.ceil(size / range_size)):
+                tasks.append((end - start, i, (start, end)))
+        else:
+            tasks.append((size, i, None))
+    
+    tasks.sort(key=lambda task: task[0], reverse=True)
+    return tasks
+
+def _run_parallel_batch(jobs, convert_options, max_workers):
+    """
+    Run batch jobs on a process pool with LPT scheduling, splitting very
+    large files across workers by byte range and merging their parts.
+    
+    Returns:
+    list: Output path per job, or None where the conversion failed
+    """
+    workers = max_workers or os.cpu_count() or 1
+    jobs = list(jobs)
+    results = [None] * len(jobs)
+    
+    tasks = _plan_batch(jobs, workers)
+    total_bytes = sum(size for size, _, _ in tasks)
+    busiest_bytes = predict_makespan([size for size, _, _ in tasks], workers)
+    throughput = _measure_throughput(str(jobs[tasks[0][1]][0]), convert_options['engine'])
+    
+    print(f"Scheduling {len(jobs)} files as {len(tasks)} tasks on {workers} workers "
+          f"({total_bytes / 1024**2:,.1f} MB, ideal {total_bytes / workers / 1024**2:,.1f} MB "
+          f"per worker, busiest {busiest_bytes / 1024**2:,.1f} MB)")
+    if throughput:
+        print(f"Predicted makespan: {busiest_bytes / throughput:.1f}s "
+              f"at {throughput / 1024**2:.1f} MB/s per worker")
+    
+    # Part files and outstanding range tasks for files split by byte range
+    parts = {}
+    remaining = {}
+    failed = set()
+    
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+        # Submitting in LPT order makes the pool hand out the largest task next
+        for size, i, byte_range in tasks:
+            csv_file, output_path = jobs[i]
+            if byte_range is None:
+                future = executor.submit(convert_csv_to_parquet, str(csv_file), output_path,
+                                         **convert_options)
+                pending[future] = (i, 'file')
+                continue
+            
+            if i not in parts:
+                output_path = output_path or str(csv_file.with_suffix('.parquet'))
+                os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+                jobs[i] = (csv_file, output_path)
+                parts[i] = []
+                remaining[i] = 0
+            part_path = f"{output_path}.part-{byte_range[0]:015d}"
+            parts[i].append(part_path)
+            remaining[i] += 1
+            future = executor.submit(_convert_csv_range, str(csv_file), byte_range, part_path,
+                                     convert_options['batch_size'], convert_options['engine'])
+            pending[future] = (i, 'range')
+        
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                i, kind = pending.pop(future)
+                csv_file, output_path = jobs[i]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"Failed to convert {csv_file}: {str(e)}")
+                    failed.add(i)
+                    result = None
+                
+                if kind != 'range':
+                    if result is not None:
+                        results[i] = result
+                        print(f"Successfully converted: {csv_file} -> {result}")
+                    continue
+                
+                # Merge the parts once every byte range of the file is done
+                remaining[i] -= 1
+                if remaining[i] > 0:
+                    continue
+                if i in failed:
+                    for part in parts[i]:
+                        if os.path.exists(part):
+                            os.remove(part)
+                    continue
+                merge = executor.submit(_merge_ipc_parts, sorted(parts[i]), output_path,
+                                        ParquetLayout.from_options(convert_options))
+                pending[merge] = (i, 'merge')
+    
+    elapsed = time.perf_counter() - start_time
+    print(f"Actual makespan: {elapsed:.1f}s")
+    return results
+
+def load_manifest(manifest_path):
+    """Load the per-source entries of a manifest, or {} if there is none"""
+    try:
+        with open(manifest_path, encoding='utf-8') as f:
+            return json.load(f).get('files', {})
+    except FileNotFoundError:
+        return {}
+    except (ValueError, AttributeError) as e:
+        print(f"Warning: ignoring unreadable manifest {manifest_path}: {str(e)}")
+        return {}
+
+def save_manifest(manifest_path, entries):
+    """Write manifest entries atomically"""
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': 1, 'files': entries}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+def _source_state(csv_file, hash_contents):
+    """Describe a source file for change tracking"""
+    stat = csv_file.stat()
+    state = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    if hash_contents:
+        state['hash'] = file_digest(csv_file)
+    return state
+
+def _plan_incremental(jobs, input_dir, manifest_dir, entries, fingerprint, hash_contents):
+    """
+    Split batch jobs into those that need converting and those whose source,
+    options and output are unchanged since the last run.
+    
+    Returns:
+    tuple: (jobs to run, manifest entries per job key, entries kept as-is)
+    """
+    todo = []
+    keys = []
+    kept = {}
+    for csv_file, output_path in jobs:
+        key = csv_file.relative_to(input_dir).as_posix()
+        output_path = output_path or str(csv_file.with_suffix('.parquet'))
+        output_rel = os.path.relpath(output_path, manifest_dir)
+        entry = entries.get(key)
+        
+        stat = csv_file.stat()
+        up_to_date = (
+            entry is not None
+            and entry.get('options') == fingerprint
+            and entry.get('output') == output_rel
+            and os.path.exists(output_path)
+            and entry.get('size') == stat.st_size
+        )
+        if up_to_date and entry.get('mtime_ns') != stat.st_mtime_ns:
+            # Touched but maybe not modified; only the content hash can tell
+            up_to_date = hash_contents and entry.get('hash') == file_digest(csv_file)
+            if up_to_date:
+                entry = dict(entry, mtime_ns=stat.st_mtime_ns)
+        
+        if up_to_date:
+            kept[key] = entry
+        else:
+            todo.append((csv_file, output_path))
+            keys.append((key, output_rel))
+    return todo, keys, kept
+
+def _remove_stale_outputs(entries, current_keys, manifest_dir):
+    """Delete outputs whose source file no longer exists"""
+    removed = 0
+    for key, entry in entries.items():
+        if key in current_keys:
+            continue
+        output_path = os.path.join(manifest_dir, entry['output'])
+        if os.path.exists(output_path):
+            os.remove(output_path)
+            print(f"Removed stale output: {output_path}")
+            removed += 1
+    return removed
+
+def batch_convert_csv_to_parquet(input_dir, output_dir=None, streaming=False,
+                                 batch_size=DEFAULT_BATCH_SIZE, engine='pandas',
+                                 max_workers=1, incremental=False, hash_contents=False,
+                                 cache_dir=None, cache_max_bytes=None, write_metadata=False,
+                                 row_group_size=None, data_page_size=None,
+                                 dictionary_pagesize_limit=None,
+                                 target_row_group_mb=DEFAULT_ROW_GROUP_MB, compression=None,
+                                 compression_level=None, compression_objective='size'):
     """
     Convert all CSV files in a directory to Parquet format.
     
     Parameters:
     input_dir (str): Directory containing CSV files
     output_dir (str): Optional directory for output Parquet files
+    streaming (bool): Convert each file in bounded-memory batches
+    batch_size (int): Number of rows per batch in streaming mode
+    engine (str): CSV parsing engine, 'pandas' or 'arrow'
+    max_workers (int): Number of worker processes. Files are spread across a
+                       process pool, largest first, when greater than 1; very
+                       large files are split across workers by byte range.
+                       None uses one process per CPU
+    incremental (bool): Keep a manifest in the output directory and only
+                        convert sources that are new or changed since the
+                        last run; outputs whose source is gone are deleted
+    hash_contents (bool): Also record a content hash, so sources that were
+                          touched but not modified are still skipped
+    cache_dir (str): Optional conversion cache directory shared by all files
+    cache_max_bytes (int): Cache size limit
+    write_metadata (bool): Write _metadata and _common_metadata summary files
+                           covering all outputs into the output directory
+    row_group_size (int or str): Rows per row group, or 'auto'
+    data_page_size (int): Target data page size in bytes
+    dictionary_pagesize_limit (int): Dictionary page size limit in bytes
+    target_row_group_mb (float): Uncompressed row group size in 'auto' mode
+    compression (str): Codec, one of COMPRESSIONS, or 'auto' to benchmark the
+                       codecs once on the first file and use the winner for all
+    compression_level (int): Codec level (zstd, lz4, gzip, brotli)
+    compression_objective (str): 'size', 'write' or 'read' for compression='auto'
     
     Returns:
-    list: List of paths to created Parquet files
+    list: List of paths to created Parquet files, in sorted input order
     """
-    converted_files = []
+    convert_options = {'streaming': streaming, 'batch_size': batch_size, 'engine': engine}
+    # Only non-default layouts change the fingerprint, so existing manifests stay valid
+    layout = ParquetLayout(row_group_size, data_page_size, dictionary_pagesize_limit,
+                           target_row_group_mb, compression, compression_level,
+                           compression_objective)
+    convert_options.update(layout.options())
+    run_options = dict(convert_options, cache_dir=cache_dir, cache_max_bytes=cache_max_bytes)
     
     # Create output directory if specified and doesn't exist
     if output_dir:
         os.makedirs(output_dir, exist_ok=True)
     
-    # Process all CSV files in the input directory
-    for csv_file in Path(input_dir).glob('**/*.csv'):
+    # Collect all CSV files in the input directory
+    jobs = []
+    for csv_file in sorted(Path(input_dir).glob('**/*.csv')):
         if output_dir:
             # Create relative path structure in output directory
             rel_path = csv_file.relative_to(input_dir)
             output_path = str(Path(output_dir) / rel_path.with_suffix('.parquet'))
         else:
             output_path = None
-            
-        try:
-            parquet_file = convert_csv_to_parquet(str(csv_file), output_path)
-            converted_files.append(parquet_file)
-            print(f"Successfully converted: {csv_file} -> {parquet_file}")
-        except Exception as e:
-            print(f"Failed to convert {csv_file}: {str(e)}")
+        jobs.append((csv_file, output_path))
+    
+    if incremental:
+        manifest_dir = output_dir or input_dir
+        manifest_path = os.path.join(manifest_dir, MANIFEST_NAME)
+        entries = load_manifest(manifest_path)
+        fingerprint = options_fingerprint(convert_options)
+        
+        current_keys = {csv_file.relative_to(input_dir).as_posix() for csv_file, _ in jobs}
+        removed = _remove_stale_outputs(entries, current_keys, manifest_dir)
+        jobs, job_keys, kept = _plan_incremental(jobs, input_dir, manifest_dir, entries,
+                                                 fingerprint, hash_contents)
+        print(f"Incremental run: {len(jobs)} to convert, {len(kept)} unchanged, "
+              f"{removed} stale outputs removed")
+        
+        # Record the source state before converting so edits made during
+        # the run are picked up next time
+        job_states = [_source_state(csv_file, hash_contents) for csv_file, _ in jobs]
+    
+    results = [None] * len(jobs)
     
-    return converted_files
+    if jobs and layout.compression == 'auto':
+        # Benchmark once so every file gets the same codec
+        layout.resolve_compression(read_csv_sample(str(jobs[0][0]), engine))
+        run_options.pop('compression_objective', None)
+        run_options.update(compression=layout.compression,
+                           compression_level=layout.compression_level)
+    
+    if max_workers == 1 or len(jobs) <= 1:
+        for i, (csv_file, output_path) in enumerate(jobs):
+            try:
+                results[i] = convert_csv_to_parquet(str(csv_file), output_path, **run_options)
+                print(f"Successfully converted: {csv_file} -> {results[i]}")
+            except Exception as e:
+                print(f"Failed to convert {csv_file}: {str(e)}")
+    else:
+        results = _run_parallel_batch(jobs, run_options, max_workers)
+    
+    if incremental:
+        for (key, output_rel), state, parquet_file in zip(job_keys, job_states, results):
+            if parquet_file is not None:
+                kept[key] = dict(state, options=fingerprint, output=output_rel)
+        save_manifest(manifest_path, kept)
+    
+    if write_metadata:
+        metadata_root = output_dir or input_dir
+        if incremental:
+            # Unchanged outputs from earlier runs belong in the summary too
+            outputs = [os.path.join(manifest_dir, entry['output']) for _, entry in sorted(kept.items())]
+        else:
+            outputs = [parquet_file for parquet_file in results if parquet_file is not None]
+        write_dataset_metadata(metadata_root, outputs)
+        print(f"Wrote dataset metadata to {metadata_root}")
+    
+    return [parquet_file for parquet_file in results if parquet_file is not None]
+
+def cache_main(argv):
+    """Entry point for `csv_to_parquet.py cache {stats,clear}`"""
+    parser = argparse.ArgumentParser(prog='csv_to_parquet.py cache',
+                                     description='Inspect or clear the conversion cache')
+    parser.add_argument('action', choices=['stats', 'clear'], help='Cache operation')
+    parser.add_argument('--cache-dir', required=True, help='Conversion cache directory')
+    parser.add_argument('--cache-size', type=float, default=DEFAULT_CACHE_SIZE_MB,
+                        help=f'Cache size limit in megabytes (default: {DEFAULT_CACHE_SIZE_MB})')
+    
+    args = parser.parse_args(argv)
+    cache = ConversionCache(args.cache_dir, int(args.cache_size * 1024 * 1024))
+    
+    if args.action == 'clear':
+        cache.clear()
+        print(f"Cleared cache {args.cache_dir}")
+        return
+    
+    stats = cache.stats()
+    mb = 1024 * 1024
+    print(f"Cache: {args.cache_dir}")
+    print(f"Entries: {stats['entries']:,}")
+    usage = f" ({stats['total_bytes'] / stats['max_bytes']:.1%})" if stats['max_bytes'] else ''
+    print(f"Size: {stats['total_bytes'] / mb:,.2f} MB of {stats['max_bytes'] / mb:,.2f} MB{usage}")
+    print(f"Hits: {stats['hits']:,}  Misses: {stats['misses']:,}  "
+          f"Hit rate: {stats['hit_rate']:.1%}")
+    print(f"Served from cache: {stats['bytes_served'] / mb:,.2f} MB")
+    print(f"Evictions: {stats['evictions']:,}")
+    if stats['entries']:
+        print(f"Least recently used: {time.ctime(stats['oldest_use'])}")
+        print(f"Most recently used: {time.ctime(stats['newest_use'])}")
 
 def main():
+    if sys.argv[1:2] == ['cache']:
+        cache_main(sys.argv[2:])
+        return
+    
     parser = argparse.ArgumentParser(description='Convert CSV files to Parquet format')
     parser.add_argument('input', help='Input CSV file or directory')
     parser.add_argument('--output', help='Output Parquet file or directory (optional)')
+    parser.add_argument('--streaming', action='store_true',
+                        help='Convert in batches with bounded memory, writing one Parquet file')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'Rows per batch in streaming mode (default: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--engine', choices=ENGINES, default='pandas',
+                        help='CSV parsing engine (default: pandas)')
+    parser.add_argument('--cache-dir', help='Reuse earlier conversions of identical content from this cache')
+    parser.add_argument('--cache-size', type=float, default=DEFAULT_CACHE_SIZE_MB,
+                        help=f'Cache size limit in megabytes (default: {DEFAULT_CACHE_SIZE_MB})')
+    parser.add_argument('--partition-by', nargs='+', metavar='COLUMN',
+                        help='Write a Hive-partitioned directory keyed on these columns (single file only)')
+    parser.add_argument('--sort-by', nargs='+', metavar='COLUMN',
+                        help='Cluster output rows on these columns (external merge sort, single file only)')
+    parser.add_argument('--sort-memory', type=float, default=DEFAULT_SORT_MEMORY_MB,
+                        help=f'Memory in MB for each sorted run before spilling '
+                             f'(default: {DEFAULT_SORT_MEMORY_MB})')
+    parser.add_argument('--temp-dir', help='Directory for spilled sort runs')
+    parser.add_argument('--row-group-size', type=parse_row_group_size,
+                        help="Rows per row group, or 'auto' to size row groups by --row-group-mb")
+    parser.add_argument('--row-group-mb', type=float, default=DEFAULT_ROW_GROUP_MB,
+                        help=f'Uncompressed row group size for --row-group-size auto '
+                             f'(default: {DEFAULT_ROW_GROUP_MB})')
+    parser.add_argument('--data-page-size', type=int, help='Target data page size in bytes')
+    parser.add_argument('--dictionary-pagesize-limit', type=int,
+                        help='Dictionary page size limit in bytes')
+    parser.add_argument('--compression', choices=COMPRESSIONS + ('auto',),
+                        help='Parquet codec, or auto to benchmark codecs on a sample (default: snappy)')
+    parser.add_argument('--compression-level', type=int,
+                        help='Codec level for zstd, lz4, gzip or brotli')
+    parser.add_argument('--compression-objective', choices=COMPRESSION_OBJECTIVES, default='size',
+                        help='What --compression auto optimizes (default: size)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes: files converted in parallel for a directory, '
+                             'byte ranges parsed in parallel for a single file (default: 1)')
+    parser.add_argument('--write-metadata', action='store_true',
+                        help='Write _metadata/_common_metadata summaries for a directory conversion')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only convert new or changed files, tracked in a manifest')
+    parser.add_argument('--hash', action='store_true',
+                        help='Record content hashes in the manifest to detect touched but unchanged files')
     
     args = parser.parse_args()
     
     input_path = Path(args.input)
+    cache_options = {'cache_dir': args.cache_dir,
+                     'cache_max_bytes': int(args.cache_size * 1024 * 1024)}
+    layout_options = {'row_group_size': args.row_group_size,
+                      'data_page_size': args.data_page_size,
+                      'dictionary_pagesize_limit': args.dictionary_pagesize_limit,
+                      'target_row_group_mb': args.row_group_mb,
+                      'compression': args.compression,
+                      'compression_level': args.compression_level,
+                      'compression_objective': args.compression_objective}
     
     if input_path.is_file():
         # Convert single file
         try:
-            output_file = convert_csv_to_parquet(str(input_path), args.output)
+            output_file = convert_csv_to_parquet(str(input_path), args.output,
+                                                 streaming=args.streaming,
+                                                 batch_size=args.batch_size,
+                                                 engine=args.engine,
+                                                 parallel_workers=args.workers,
+                                                 partition_by=args.partition_by,
+                                                 sort_by=args.sort_by,
+                                                 sort_memory_mb=args.sort_memory,
+                                                 temp_dir=args.temp_dir,
+                                                 **layout_options,
+                                                 **cache_options)
             print(f"Successfully converted: {input_path} -> {output_file}")
         except Exception as e:
             print(f"Conversion failed: {str(e)}")
     
     elif input_path.is_dir():
         # Convert all CSV files in directory
-        converted_files = batch_convert_csv_to_parquet(str(input_path), args.output)
+        converted_files = batch_convert_csv_to_parquet(str(input_path), args.output,
+                                                       streaming=args.streaming,
+                                                       batch_size=args.batch_size,
+                                                       engine=args.engine,
+                                                       max_workers=args.workers,
+                                                       incremental=args.incremental,
+                                                       hash_contents=args.hash,
+                                                       write_metadata=args.write_metadata,
+                                                       **layout_options,
+                                                       **cache_options)
         print(f"\nConverted {len(converted_files)} files")
     
     else:
@@ -1,20 +1,512 @@
+import os
+import ast
+import operator
+from functools import reduce
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import numpy as np
 import argparse
 from pathlib import Path
 
-def view_parquet(file_path, num_rows=5, show_info=True, show_schema=True):
+# Rows decoded per batch when a column has to be streamed for its statistics
+STATS_BATCH_ROWS = 65536
+
+# Smallest hashes kept by the distinct-count sketch; the estimate's error is about 1/sqrt(k)
+DISTINCT_SKETCH_SIZE = 4096
+
+# Items kept per level of the quantile sketch; rank error shrinks roughly as 1/k
+QUANTILE_SKETCH_K = 2048
+
+# Quantiles reported by --describe, as in DataFrame.describe()
+DEFAULT_PERCENTILES = (0.25, 0.5, 0.75)
+
+# Comparison operators allowed in --where conditions
+COMPARISONS = {ast.Eq: operator.eq, ast.NotEq: operator.ne, ast.Lt: operator.lt,
+               ast.LtE: operator.le, ast.Gt: operator.gt, ast.GtE: operator.ge}
+
+def _format_bytes(num_bytes):
+    """Human-readable byte count"""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(num_bytes) < 1024:
+            return f"{num_bytes:,.2f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:,.2f} TB"
+
+def footer_summary(metadata):
+    """
+    Summarize a Parquet footer without reading any data pages
+    
+    Parameters:
+    metadata (pq.FileMetaData): Footer of the file
+    
+    Returns:
+    dict: Row, column and row group counts plus compressed and uncompressed
+          sizes summed over all column chunks
+    """
+    compressed = 0
+    uncompressed = 0
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        for j in range(row_group.num_columns):
+            column = row_group.column(j)
+            compressed += column.total_compressed_size
+            uncompressed += column.total_uncompressed_size
+            
+    return {'rows': metadata.num_rows,
+            'columns': len(metadata.schema.to_arrow_schema().names),
+            'row_groups': metadata.num_row_groups,
+            'compressed_bytes': compressed,
+            'uncompressed_bytes': uncompressed,
+            'created_by': metadata.created_by}
+
+def parse_where(text):
+    """
+    Turn a condition such as "country == 'DE' and amount > 100" into a
+    filter expression.
+    
+    Conditions compare a column name with a literal (==, !=, <, <=, >, >=,
+    in, not in, is None, is not None) and are combined with and, or, not and
+    parentheses. Literals use Python syntax.
+    
+    Returns:
+    pc.Expression: Filter usable for row group pruning and row filtering
+    """
+    def operand(node):
+        if isinstance(node, ast.Name):
+            return pc.field(node.id)
+        try:
+            return ast.literal_eval(node)
+        except ValueError:
+            raise ValueError(f"Unsupported value in condition: {ast.unparse(node)}")
+    
+    def compare(left, op, right):
+        if isinstance(op, (ast.In, ast.NotIn)):
+            matches = operand(left).isin(list(operand(right)))
+            return ~matches if isinstance(op, ast.NotIn) else matches
+        if isinstance(op, (ast.Is, ast.IsNot)):
+            if operand(right) is not None:
+                raise ValueError("Only 'is None' and 'is not None' are supported")
+            is_null = operand(left).is_null()
+            return ~is_null if isinstance(op, ast.IsNot) else is_null
+        if type(op) not in COMPARISONS:
+            raise ValueError(f"Unsupported operator in condition: {type(op).__name__}")
+        return COMPARISONS[type(op)](operand(left), operand(right))
+    
+    def convert(node):
+        if isinstance(node, ast.BoolOp):
+            combine = operator.and_ if isinstance(node.op, ast.And) else operator.or_
+            return reduce(combine, [convert(value) for value in node.values])
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            return ~convert(node.operand)
+        if isinstance(node, ast.Compare):
+            # Chains such as 1 < amount < 5 become one comparison per pair
+            lefts = [node.left] + node.comparators[:-1]
+            return reduce(operator.and_, [compare(left, op, right) for left, op, right
+                                          in zip(lefts, node.ops, node.comparators)])
+        raise ValueError(f"Unsupported condition: {ast.unparse(node)}")
+    
+    try:
+        tree = ast.parse(text, mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"Invalid condition {text!r}: {e.msg}")
+    return convert(tree.body)
+
+def to_expression(filters):
+    """Accept an expression or pyarrow's list-of-tuples filter format"""
+    if filters is None or isinstance(filters, pc.Expression):
+        return filters
+    return pq.filters_to_expression(filters)
+
+def matching_row_groups(file_path, filter_expression):
+    """
+    Row groups of a file that may hold rows matching the filter, judged from
+    the min/max statistics in the footer
+    
+    Returns:
+    list: One fragment per row group that cannot be ruled out
+    """
+    fragment = next(ds.dataset(file_path, format='parquet').get_fragments())
+    return fragment.split_by_row_group(filter_expression)
+
+def read_head(parquet_file, num_rows, columns=None, filter_expression=None, file_path=None):
+    """
+    Read the first rows of a Parquet file, decoding batches one row group
+    at a time and stopping as soon as enough rows have been read
+    
+    Parameters:
+    parquet_file (pq.ParquetFile): Open Parquet file
+    num_rows (int): Number of rows wanted
+    columns (list): Only read these columns
+    filter_expression (pc.Expression): Only return matching rows. Row groups
+                                       ruled out by their statistics are skipped
+    file_path (str): Path of the file, needed when filtering
+    
+    Returns:
+    DataFrame: Up to num_rows rows
+    """
+    if filter_expression is None:
+        # One row group at a time; iterating the whole file lets Arrow read ahead
+        batches_iter = (batch for i in range(parquet_file.num_row_groups)
+                        for batch in parquet_file.iter_batches(batch_size=max(num_rows, 1),
+                                                               row_groups=[i], columns=columns,
+                                                               use_pandas_metadata=True))
+    else:
+        batches_iter = (batch for row_group in matching_row_groups(file_path, filter_expression)
+                        for batch in row_group.to_batches(columns=columns,
+                                                          filter=filter_expression,
+                                                          batch_size=max(num_rows, 1)))
+    
+    batches = []
+    rows = 0
+    if num_rows > 0:
+        for batch in batches_iter:
+            batches.append(batch)
+            rows += batch.num_rows
+            if rows >= num_rows:
+                break
+    
+    if batches:
+        table = pa.Table.from_batches(batches)
+    else:
+        schema = parquet_file.schema_arrow
+        if columns is not None:
+            schema = pa.schema([schema.field(name) for name in columns], schema.metadata)
+        table = schema.empty_table()
+    return table.slice(0, num_rows).to_pandas()
+
+def _distinct_estimate(hashes):
+    """Distinct values estimated from the k smallest 64-bit hashes seen (KMV sketch)"""
+    if len(hashes) < DISTINCT_SKETCH_SIZE:
+        return len(hashes)
+    return int((DISTINCT_SKETCH_SIZE - 1) / (float(hashes[-1]) / 2.0 ** 64))
+
+def _stream_column_stats(parquet_file, name):
+    """
+    Min, max, null count and an estimated distinct count of one column,
+    decoded a batch at a time so memory stays bounded
+    """
+    low = high = None
+    nulls = 0
+    hashes = np.array([], dtype=np.uint64)
+    for batch in parquet_file.iter_batches(batch_size=STATS_BATCH_ROWS, columns=[name]):
+        column = batch.column(0)
+        nulls += column.null_count
+        values = column.drop_null()
+        if not len(values):
+            continue
+        
+        extremes = pc.min_max(values)
+        batch_low, batch_high = extremes['min'].as_py(), extremes['max'].as_py()
+        low = batch_low if low is None else min(low, batch_low)
+        high = batch_high if high is None else max(high, batch_high)
+        
+        batch_hashes = pd.util.hash_array(values.to_numpy(zero_copy_only=False), categorize=True)
+        hashes = np.unique(np.concatenate([hashes, batch_hashes]))[:DISTINCT_SKETCH_SIZE]
+    return low, high, nulls, _distinct_estimate(hashes)
+
+def column_stats(parquet_file, columns=None, distinct=False):
+    """
+    Per-column summary aggregated from the row group statistics in the footer
+    
+    Min and max are combined over row groups and null counts summed. Columns
+    whose statistics are missing from any row group are streamed instead,
+    which also gives a distinct-count estimate. Otherwise the distinct count
+    is only known if the writer recorded it (an upper bound when there are
+    several row groups); Arrow never does, so with distinct set a missing
+    count counts as missing statistics and the column is streamed too.
+    
+    Parameters:
+    parquet_file (pq.ParquetFile): Open Parquet file
+    columns (list): Only summarize these columns
+    distinct (bool): Scan columns whose footer lacks a distinct count to
+                     estimate it
+    
+    Returns:
+    DataFrame: One row per column with min, max, nulls, distinct, source
+               (footer or scan), encodings, codec and compressed and
+               uncompressed bytes
+    """
+    metadata = parquet_file.metadata
+    top_level = set(parquet_file.schema_arrow.names)
+    summaries = {}
+    
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        for j in range(row_group.num_columns):
+            chunk = row_group.column(j)
+            name = chunk.path_in_schema
+            if columns is not None and name.split('.')[0] not in columns:
+                continue
+            
+            summary = summaries.setdefault(name, {
+                'column': name, 'min': None, 'max': None, 'nulls': 0, 'distinct': None,
+                'distinct_counts': [], 'complete': True, 'encodings': set(), 'codecs': set(),
+                'compressed': 0, 'uncompressed': 0})
+            summary['encodings'].update(chunk.encodings)
+            summary['codecs'].add(chunk.compression)
+            summary['compressed'] += chunk.total_compressed_size
+            summary['uncompressed'] += chunk.total_uncompressed_size
+            
+            stats = chunk.statistics
+            if stats is None or not stats.has_null_count:
+                summary['complete'] = False
+                continue
+            summary['nulls'] += stats.null_count
+            if stats.has_distinct_count:
+                summary['distinct_counts'].append(stats.distinct_count)
+            if not stats.has_min_max:
+                # An all-null chunk has no min/max but still counts as complete
+                if stats.null_count != chunk.num_values:
+                    summary['complete'] = False
+                continue
+            summary['min'] = stats.min if summary['min'] is None else min(summary['min'], stats.min)
+            summary['max'] = stats.max if summary['max'] is None else max(summary['max'], stats.max)
+    
+    rows = []
+    for name, summary in summaries.items():
+        source = 'footer'
+        if len(summary['distinct_counts']) == metadata.num_row_groups:
+            distinct = sum(summary['distinct_counts'])
+            summary['distinct'] = distinct if metadata.num_row_groups == 1 else f"<={distinct}"
+        if distinct and summary['distinct'] is None:
+            summary['complete'] = False
+        if not summary['complete'] and name in top_level:
+            summary['min'], summary['max'], summary['nulls'], summary['distinct'] = \
+                _stream_column_stats(parquet_file, name)
+            source = 'scan'
+        elif not summary['complete']:
+            summary['min'] = summary['max'] = summary['nulls'] = None
+            source = 'n/a'
+        
+        rows.append({'column': name, 'min': summary['min'], 'max': summary['max'],
+                     'nulls': summary['nulls'], 'distinct': summary['distinct'],
+                     'source': source,
+                     'encodings': ','.join(sorted(summary['encodings'])),
+                     'codec': ','.join(sorted(summary['codecs'])),
+                     'compressed': _format_bytes(summary['compressed']),
+                     'uncompressed': _format_bytes(summary['uncompressed'])})
+    return pd.DataFrame(rows)
+
+class QuantileSketch:
+    """
+    Mergeable, fixed-size sketch for approximate quantiles (KLL-style
+    compaction).
+    
+    Level h holds items that each stand for 2**h input values. Whenever a
+    level grows past k items it is sorted and every other item, from a
+    random offset, is promoted to the next level, so memory stays around
+    k items per level, i.e. O(k log n).
+    """
+    
+    def __init__(self, k=QUANTILE_SKETCH_K, seed=0):
+        self.k = k
+        self.levels = []
+        self.rng = np.random.default_rng(seed)
+    
+    def update(self, values):
+        """Add a numpy array of values"""
+        self._add(0, values)
+        self._compact()
+    
+    def merge(self, other):
+        """Fold another sketch into this one"""
+        for level, items in enumerate(other.levels):
+            self._add(level, items)
+        self._compact()
+    
+    def _add(self, level, items):
+        while len(self.levels) <= level:
+            self.levels.append(np.empty(0))
+        self.levels[level] = np.concatenate([self.levels[level], items])
+    
+    def _compact(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self.k:
+                items = np.sort(items)
+                # An odd item out stays behind so the promoted half is exact
+                leftover = items[len(items) - len(items) % 2:]
+                promoted = items[self.rng.integers(2):len(items) - len(items) % 2:2]
+                self.levels[level] = leftover
+                self._add(level + 1, promoted)
+            level += 1
+    
+    def quantiles(self, qs):
+        """Approximate values at the quantiles qs (0-1), or NaN when empty"""
+        items = np.concatenate(self.levels) if self.levels else np.empty(0)
+        if not len(items):
+            return [float('nan')] * len(qs)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h)
+                                  for h, level in enumerate(self.levels)])
+        order = np.argsort(items)
+        items = items[order]
+        cumulative = np.cumsum(weights[order])
+        ranks = np.asarray(qs) * cumulative[-1]
+        return items[np.minimum(np.searchsorted(cumulative, ranks), len(items) - 1)].tolist()
+
+class ColumnAccumulator:
+    """
+    One-pass, mergeable count / mean / variance / min / max plus a quantile
+    sketch for a numeric column. Moments are combined with the parallel form
+    of Welford's algorithm, so partial results from row groups processed
+    separately merge exactly.
+    """
+    
+    def __init__(self, seed=0):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+        self.sketch = QuantileSketch(seed=seed)
+    
+    def _combine(self, count, mean, m2):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+    
+    def update(self, values):
+        """Add a float numpy array without NaNs"""
+        if not len(values):
+            return
+        mean = float(values.mean())
+        self._combine(len(values), mean, float(((values - mean) ** 2).sum()))
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.sketch.update(values)
+    
+    def merge(self, other):
+        if not other.count:
+            return
+        self._combine(other.count, other.mean, other.m2)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+    
+    def result(self, percentiles=DEFAULT_PERCENTILES):
+        """Summary in the layout of DataFrame.describe()"""
+        empty = not self.count
+        values = {'count': self.count,
+                  'mean': float('nan') if empty else self.mean,
+                  'std': float('nan') if self.count < 2 else (self.m2 / (self.count - 1)) ** 0.5,
+                  'min': float('nan') if empty else self.min}
+        for q, value in zip(percentiles, self.sketch.quantiles(percentiles)):
+            values[f"{q * 100:g}%"] = value
+        values['max'] = float('nan') if empty else self.max
+        return values
+
+def _describe_row_group(row_group, names, filter_expression, seed):
+    """Accumulate the numeric columns of one row group, a batch at a time"""
+    accumulators = {name: ColumnAccumulator(seed) for name in names}
+    for batch in row_group.to_batches(columns=names, filter=filter_expression,
+                                      batch_size=STATS_BATCH_ROWS):
+        for name in names:
+            column = batch.column(name).drop_null()
+            if pa.types.is_decimal(column.type):
+                column = column.cast(pa.float64())
+            values = column.to_numpy(zero_copy_only=False).astype(np.float64, copy=False)
+            accumulators[name].update(values[~np.isnan(values)])
+    return accumulators
+
+def describe_parquet(file_path, columns=None, filters=None, percentiles=DEFAULT_PERCENTILES,
+                     workers=None):
+    """
+    count, mean, std, min, quantiles and max of every numeric column, in
+    bounded memory
+    
+    Row groups are processed in parallel threads, each streaming its batches
+    through per-column accumulators that are then merged, so memory depends
+    on the batch size and worker count, never on the file size. Quantiles
+    are approximate.
+    
+    Parameters:
+    file_path (str): Path to Parquet file
+    columns (list): Only describe these columns
+    filters (list or pc.Expression): Only describe matching rows; row groups
+                                     ruled out by their statistics are skipped
+    percentiles (list): Quantiles to report, between 0 and 1
+    workers (int): Threads used; defaults to one per CPU
+    
+    Returns:
+    DataFrame: One column per numeric column, rows as in DataFrame.describe()
+    """
+    filter_expression = to_expression(filters)
+    schema = pq.ParquetFile(file_path).schema_arrow
+    names = [field.name for field in schema
+             if (pa.types.is_integer(field.type) or pa.types.is_floating(field.type)
+                 or pa.types.is_decimal(field.type))
+             and (columns is None or field.name in columns)]
+    if not names:
+        return pd.DataFrame()
+    
+    totals = {name: ColumnAccumulator() for name in names}
+    
+    def merge(futures):
+        for future in futures:
+            for name, accumulator in future.result().items():
+                totals[name].merge(accumulator)
+    
+    workers = workers or os.cpu_count() or 1
+    row_groups = matching_row_groups(file_path, filter_expression)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Keep about one row group per worker in flight and merge each result as
+        # it arrives, so only that many partial accumulators are ever alive
+        pending = set()
+        for seed, row_group in enumerate(row_groups):
+            pending.add(executor.submit(_describe_row_group, row_group, names,
+                                        filter_expression, seed))
+            if len(pending) >= workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                merge(done)
+        merge(pending)
+    
+    return pd.DataFrame({name: totals[name].result(percentiles) for name in names})
+
+def view_parquet(file_path, num_rows=5, show_info=True, show_schema=True, show_preview=True,
+                 columns=None, filters=None, show_stats=False, show_describe=False,
+                 workers=None, show_distinct=False):
     """
     View contents of a Parquet file
     
+    Info and schema come from the file footer alone, so they cost the same
+    on any file size. The preview reads only as many batches as it needs,
+    usually from the first row group.
+    
     Parameters:
     file_path (str): Path to Parquet file
     num_rows (int): Number of rows to display (default=5)
-    show_info (bool): Whether to show DataFrame info
+    show_info (bool): Whether to show row, column and row group counts and sizes
     show_schema (bool): Whether to show data schema
+    show_preview (bool): Whether to read and show the first rows
+    columns (list): Only read and show these columns
+    filters (list or pc.Expression): Only show matching rows, as an
+                                     expression or in pyarrow's list-of-tuples
+                                     format. Row groups whose statistics rule
+                                     the filter out are never read
+    show_stats (bool): Whether to show per-column min, max, null and distinct
+                       counts, encodings and sizes from the footer statistics
+    show_describe (bool): Whether to show count, mean, std, min, max and
+                          approximate quantiles of the numeric columns,
+                          streamed in bounded memory (honours columns and filters)
+    workers (int): Threads used by the describe pass
+    show_distinct (bool): Whether the statistics should estimate distinct
+                          counts the footer lacks by scanning those columns
+    
+    Returns:
+    DataFrame: The previewed rows, or None if the preview was skipped or the
+               file could not be read
     """
     try:
-        # Read Parquet file
-        df = pd.read_parquet(file_path)
+        parquet_file = pq.ParquetFile(file_path)
+        metadata = parquet_file.metadata
+        filter_expression = to_expression(filters)
         
         # Print file information
         print(f"\n{'='*50}")
@@ -23,21 +515,50 @@ def view_parquet(file_path, num_rows=5, show_info=True, show_schema=True):
         
         # Show basic information
         if show_info:
-            print("\nDataFrame Info:")
-            print(f"Number of rows: {len(df)}")
-            print(f"Number of columns: {len(df.columns)}")
-            print("\nMemory usage:")
-            print(df.info(memory_usage='deep'))
+            summary = footer_summary(metadata)
+            print("\nFile Info:")
+            print(f"Number of rows: {summary['rows']:,}")
+            print(f"Number of columns: {summary['columns']}")
+            print(f"Number of row groups: {summary['row_groups']}")
+            print(f"File size: {_format_bytes(os.path.getsize(file_path))}")
+            print(f"Compressed data: {_format_bytes(summary['compressed_bytes'])}")
+            print(f"Uncompressed data: {_format_bytes(summary['uncompressed_bytes'])}")
+            if summary['compressed_bytes']:
+                print(f"Compression ratio: "
+                      f"{summary['uncompressed_bytes'] / summary['compressed_bytes']:.2f}")
+            print(f"Created by: {summary['created_by']}")
+            if filter_expression is not None:
+                matching = len(matching_row_groups(file_path, filter_expression))
+                print(f"Row groups that may match the filter: {matching} of {summary['row_groups']}")
             
         # Show schema
         if show_schema:
             print("\nSchema:")
-            for column in df.columns:
-                print(f"{column}: {df[column].dtype}")
+            for field in parquet_file.schema_arrow:
+                if columns is None or field.name in columns:
+                    print(f"{field.name}: {field.type}")
+                
+        # Show column statistics
+        if show_stats or show_distinct:
+            print("\nColumn statistics:")
+            with pd.option_context('display.max_columns', None, 'display.width', None,
+                                   'display.max_colwidth', 40):
+                print(column_stats(parquet_file, columns,
+                                   distinct=show_distinct).to_string(index=False))
         
+        # Show streaming summary statistics
+        if show_describe:
+            print("\nDescribe (quantiles approximate):")
+            with pd.option_context('display.max_columns', None, 'display.width', None):
+                print(describe_parquet(file_path, columns, filter_expression, workers=workers))
+        
+        if not show_preview:
+            return None
+            
         # Show data preview
+        df = read_head(parquet_file, num_rows, columns, filter_expression, file_path)
         print(f"\nFirst {num_rows} rows:")
-        print(df.head(num_rows))
+        print(df)
         
         return df
         
@@ -49,8 +570,22 @@ def main():
     parser = argparse.ArgumentParser(description='View Parquet file contents')
     parser.add_argument('file', help='Path to Parquet file')
     parser.add_argument('--rows', type=int, default=5, help='Number of rows to display (default: 5)')
-    parser.add_argument('--no-info', action='store_true', help='Skip showing DataFrame info')
+    parser.add_argument('--no-info', action='store_true', help='Skip showing file info')
     parser.add_argument('--no-schema', action='store_true', help='Skip showing schema')
+    parser.add_argument('--no-preview', action='store_true',
+                        help='Skip reading data; show only what the footer holds')
+    parser.add_argument('--stats', action='store_true',
+                        help='Show per-column statistics from the footer, scanning columns that lack them')
+    parser.add_argument('--distinct', action='store_true',
+                        help='Estimate distinct counts missing from the footer by scanning those '
+                             'columns (implies --stats)')
+    parser.add_argument('--describe', action='store_true',
+                        help='Show count, mean, std, min, max and approximate quantiles of numeric '
+                             'columns, streamed in bounded memory')
+    parser.add_argument('--workers', type=int,
+                        help='Threads for --describe (default: one per CPU)')
+    parser.add_argument('--columns', help='Comma-separated columns to read, e.g. a,b,c')
+    parser.add_argument('--where', help='Row filter, e.g. "country == \'DE\' and amount > 100"')
     
     args = parser.parse_args()
     
@@ -58,7 +593,17 @@ def main():
         print(f"Error: File {args.file} does not exist")
         return
         
-    view_parquet(args.file, args.rows, not args.no_info, not args.no_schema)
+    columns = [name.strip() for name in args.columns.split(',')] if args.columns else None
+    try:
+        filters = parse_where(args.where) if args.where else None
+    except ValueError as e:
+        print(f"Error: {str(e)}")
+        return
+    
+    view_parquet(args.file, args.rows, not args.no_info, not args.no_schema, not args.no_preview,
+                 columns=columns, filters=filters, show_stats=args.stats,
+                 show_describe=args.describe, workers=args.workers,
+                 show_distinct=args.distinct)
 
 if __name__ == "__main__":
     main()